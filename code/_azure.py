@@ -0,0 +1,80 @@
+"""
+Shared Azure Quantum connection helpers for the experiment scripts.
+
+Both experiments previously built their own DeviceCodeCredential and
+backend at import, so running them back-to-back in a pipeline re-prompted
+the device-code flow and re-fetched backend metadata each time. The
+credential here persists its token cache to disk and the provider/backend
+handles are memoized, so the handshake cost is paid once per machine, not
+once per script.
+"""
+
+import os
+from functools import lru_cache
+
+from azure.quantum import Workspace
+from azure.quantum.qiskit import AzureQuantumProvider
+from azure.quantum.target.pasqal import Pasqal
+from azure.identity import DeviceCodeCredential, TokenCachePersistenceOptions
+
+
+def _require_env():
+    tenant_id = os.environ.get("AZURE_TENANT_ID")
+    resource_id = os.environ.get("AZURE_RESOURCE_ID")
+    if not tenant_id or not resource_id:
+        raise EnvironmentError(
+            "AZURE_TENANT_ID and AZURE_RESOURCE_ID must be set as environment "
+            "variables. Example:\n"
+            "  export AZURE_TENANT_ID='5b322a00-...'\n"
+            "  export AZURE_RESOURCE_ID='/subscriptions/fe4d586e-...'"
+        )
+    return tenant_id, resource_id
+
+
+@lru_cache(maxsize=1)
+def _credential():
+    """One credential for every handle below.
+
+    Persisted token cache: the second script (and second run) reuses the
+    cached token instead of prompting for a fresh device code.
+    """
+    tenant_id, _ = _require_env()
+    return DeviceCodeCredential(
+        tenant_id=tenant_id,
+        cache_persistence_options=TokenCachePersistenceOptions(
+            allow_unencrypted_storage=True),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_provider():
+    """Authenticate once and return a shared AzureQuantumProvider."""
+    _, resource_id = _require_env()
+    location = os.environ.get("AZURE_LOCATION", "eastus")
+    return AzureQuantumProvider(resource_id=resource_id, location=location,
+                                credential=_credential())
+
+
+@lru_cache(maxsize=4)
+def get_backend(name="ionq.simulator"):
+    """Memoized backend lookup on the shared provider."""
+    return get_provider().get_backend(name)
+
+
+@lru_cache(maxsize=1)
+def get_workspace():
+    """Authenticate once and return a shared Workspace handle."""
+    _, resource_id = _require_env()
+    location = os.environ.get("AZURE_LOCATION", "eastus")
+    print(f"Authenticating to Azure (Location: {location})...")
+    return Workspace(
+        resource_id=resource_id,
+        location=location,
+        credential=_credential(),
+    )
+
+
+@lru_cache(maxsize=4)
+def get_target(name="pasqal.sim.emu-tn"):
+    """Memoized Pasqal target on the shared workspace."""
+    return Pasqal(get_workspace(), name=name)
@@ -1,9 +1,15 @@
-import os
 import warnings
+from functools import lru_cache
 import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
-from azure.quantum.qiskit import AzureQuantumProvider
-from azure.identity import DeviceCodeCredential
+from qiskit.circuit import CircuitInstruction, ParameterVector
+from qiskit.circuit.equivalence_library import SessionEquivalenceLibrary
+from qiskit.circuit.library import RZGate
+from qiskit.transpiler import PassManager
+from qiskit.transpiler.passes import (BasisTranslator, CommutativeCancellation,
+                                      Optimize1qGatesDecomposition)
+
+from _azure import get_backend
 
 warnings.filterwarnings("ignore")
 
@@ -11,82 +17,78 @@ warnings.filterwarnings("ignore")
 # 1. SETUP AZURE
 # ============================================================================
 
-# Load credentials from environment variables
-tenant_id = os.environ.get("AZURE_TENANT_ID")
-resource_id = os.environ.get("AZURE_RESOURCE_ID")
-
 print("1. Authenticating...")
-credential = DeviceCodeCredential(tenant_id=tenant_id)
-provider = AzureQuantumProvider(resource_id=resource_id, location="eastus", credential=credential)
-backend = provider.get_backend("ionq.simulator")
+backend = get_backend("ionq.simulator")
 print(f"2. Connected to backend: {backend.name}")
 
 # ============================================================================
-# 2. MANUAL GATES (FIXED)
+# 2. BRIDGE HAMILTONIAN
 # ============================================================================
 
-def apply_rxx(qc, theta, q1, q2):
-    """Hamiltonian simulation of e^(-i * theta * XX)"""
-    qc.h(q1)
-    qc.h(q2)
-    qc.cx(q1, q2)
-    qc.rz(2 * theta, q2) # FIX: Added factor of 2
+# XX, YY and ZZ commute on a qubit pair, so e^(-iθ(XX+YY+ZZ)) factors
+# exactly — and its Cartan (KAK) form needs only 3 CX per pair, half the
+# former count, with no H/Rx basis ping-pong between the three terms.
+def apply_xxyyzz(qc, theta, q1, q2):
     qc.cx(q1, q2)
+    qc.rx(2 * theta - np.pi/2, q1)
+    qc.rz(2 * theta, q2)
     qc.h(q1)
-    qc.h(q2)
-
-def apply_ryy(qc, theta, q1, q2):
-    """Hamiltonian simulation of e^(-i * theta * YY)"""
-    qc.rx(np.pi/2, q1)
-    qc.rx(np.pi/2, q2)
     qc.cx(q1, q2)
-    qc.rz(2 * theta, q2) # FIX: Added factor of 2
+    qc.h(q1)
+    qc.rz(-2 * theta, q2)
     qc.cx(q1, q2)
-    qc.rx(-np.pi/2, q1)
+    qc.rx(np.pi/2, q1)
     qc.rx(-np.pi/2, q2)
 
-def apply_rzz(qc, theta, q1, q2):
-    """Hamiltonian simulation of e^(-i * theta * ZZ)"""
-    qc.cx(q1, q2)
-    qc.rz(2 * theta, q2) # FIX: Added factor of 2
-    qc.cx(q1, q2)
-
 # ============================================================================
 # 3. BUILDER
 # ============================================================================
 
-def build_wormhole_geometry(gamma, coupling=0.785):
+# Gate-angle parameters: 4 A-side noise + 4 B-side noise + 4 bridge angles.
+# Binding values instead of rebuilding lets one transpile amortize over the
+# whole gamma sweep.
+THETA = ParameterVector("θ", 4 + 4 + 4)
+
+# Per-pair entanglement phase kick π/(i+1), precomputed once so the
+# builder loop indexes a tuple instead of redoing the division per gate
+ENT_ANGLES = (np.pi, np.pi / 2, np.pi / 3, np.pi / 4)
+
+# Uncorrelated noise pattern to break symmetry (π pre-folded in)
+NOISE_PATTERN = np.array([1.0, -0.8, 0.5, -1.2]) * np.pi
+
+def build_wormhole_geometry():
     reg_A = QuantumRegister(4, 'A')
     reg_B = QuantumRegister(4, 'B')
     reg_msg = QuantumRegister(1, 'msg')
     creg = ClassicalRegister(1, 'c')
     qc = QuantumCircuit(reg_A, reg_B, reg_msg, creg)
 
-    # 1. ENTANGLEMENT (Throat)
+    # 1. ENTANGLEMENT (Throat) with fused CFD noise
+    # The phase kick and the CFD noise Rz act back-to-back on every qubit
+    # except A0 (the SWAP target), so emit one net-angle Rz instead of two.
     for i in range(4):
         qc.h(reg_A[i])
         qc.cx(reg_A[i], reg_B[i])
-        qc.rz(np.pi/(i+1), reg_A[i])
-        qc.rz(-np.pi/(i+1), reg_B[i])
+
+    # The Rz layer commutes across pairs, so emit it as one batched
+    # data.extend — skips per-gate append validation on known-good bits.
+    kicks = [CircuitInstruction(RZGate(ENT_ANGLES[0]), (reg_A[0],))]
+    kicks += [CircuitInstruction(RZGate(ENT_ANGLES[i] + THETA[i]),
+                                 (reg_A[i],)) for i in range(1, 4)]
+    kicks += [CircuitInstruction(RZGate(-ENT_ANGLES[i] + THETA[4 + i]),
+                                 (reg_B[i],)) for i in range(4)]
+    qc.data.extend(kicks)
 
     # 2. MESSAGE INJECTION
     qc.h(reg_msg[0])
     qc.swap(reg_msg[0], reg_A[0])
 
-    # 3. CHAOTIC NOISE (CFD Layer)
-    if gamma > 0:
-        # Uncorrelated noise pattern to break symmetry
-        noise_pattern = [1.0, -0.8, 0.5, -1.2]
-        for i in range(4):
-            angle = gamma * np.pi * noise_pattern[i]
-            qc.rz(angle, reg_A[i])
-            qc.rz(-angle * 1.5, reg_B[i])
+    # 3. CHAOTIC NOISE (CFD Layer) — A0 sees its noise after injection
+    qc.rz(THETA[0], reg_A[0])
 
-    # 4. BRIDGE (Scrambling)
+    # 4. BRIDGE (Scrambling) — one fused Heisenberg block (3 CX) per pair
     for i in range(4):
-        apply_rxx(qc, coupling, reg_A[i], reg_B[i])
-        apply_ryy(qc, coupling, reg_A[i], reg_B[i])
-        apply_rzz(qc, coupling, reg_A[i], reg_B[i])
+        apply_xxyyzz(qc, THETA[8 + i], reg_A[i], reg_B[i])
 
     # 5. VERIFICATION
     qc.h(reg_B[0])
@@ -94,6 +96,36 @@ def build_wormhole_geometry(gamma, coupling=0.785):
 
     return qc
 
+
+def wormhole_parameter_binds(gamma, coupling=0.785):
+    """Map THETA entries to floats for a given (gamma, coupling) point."""
+    noise = gamma * NOISE_PATTERN
+    values = np.concatenate([noise, -1.5 * noise, np.full(4, coupling)])
+    return dict(zip(THETA, values))
+
+# ============================================================================
+# 3.5. TRANSPILE CACHE
+# ============================================================================
+
+# Submitting the raw circuit makes Azure/IonQ re-transpile it on every run.
+# Transpile the parametric circuit once; per sweep point only the parameter
+# values are assigned. The trapped-ion target is all-to-all on 9 qubits, so
+# the preset level-3 pipeline (SABRE routing, 2q block resynthesis) is
+# wasted work — only basis translation and 1q cleanup actually help here.
+IONQ_BASIS = ['cx', 'id', 'rz', 'ry', 'rx', 'h', 'x']
+
+pm = PassManager([
+    BasisTranslator(SessionEquivalenceLibrary, IONQ_BASIS),
+    Optimize1qGatesDecomposition(IONQ_BASIS),
+    CommutativeCancellation(basis_gates=IONQ_BASIS),
+])
+ISA_TEMPLATE = pm.run(build_wormhole_geometry())
+
+@lru_cache(maxsize=None)
+def get_isa_circuit(gamma, coupling=0.785):
+    return ISA_TEMPLATE.assign_parameters(
+        wormhole_parameter_binds(gamma, coupling))
+
 # ============================================================================
 # 4. RUN PROOF
 # ============================================================================
@@ -110,35 +142,42 @@ CORRECTED_COUPLING = 0.785
 
 print("\n3. Running Final Proof (Corrected Hamiltonian)...")
 
-for exp in experiments:
-    print(f"\n--- Condition: {exp['label']} (γ={exp['gamma']}) ---")
-
-    qc = build_wormhole_geometry(gamma=exp['gamma'], coupling=CORRECTED_COUPLING)
-
-    try:
-        # Using 100 shots
-        job = backend.run(qc, shots=100)
+# Submit both conditions in ONE job so we pay the queue wait once
+all_qcs = [get_isa_circuit(gamma=exp['gamma'], coupling=CORRECTED_COUPLING)
+           for exp in experiments]
+
+SHOTS = 100
+
+try:
+    # One Azure Quantum session for the whole batch: the authenticated
+    # connection (and the service-side job grouping) is reused across
+    # circuits instead of a cold handshake per submission.
+    with backend.open_session(name="wormhole-phase-transition"):
+        # Circuits are already ISA-transpiled (section 3.5); skip the
+        # adapter's own transpile pass so submission is a straight
+        # serialization of the cached gate list.
+        job = backend.run(all_qcs, shots=SHOTS, skip_transpilation=True)
         res = job.result()
 
-        if res.success:
-            counts = res.get_counts()
-
-            # Count the Zeros
-            success_count = counts.get('0', 0)
-
-            # Strict Fidelity Calculation
-            fidelity = (success_count / 100 - 0.5) * 2
-            if fidelity < 0: fidelity = 0
-
-            print(f"   -> Counts: {counts}")
-            print(f"   -> Fidelity: {fidelity:.4f}")
-
-            if fidelity > 0.85:
-                print("   ✅ STATUS: TRAVERSABLE")
-            elif fidelity < 0.2:
-                print("   ⛔ STATUS: COLLAPSED")
-            else:
-                print("   ⚠️ STATUS: NOISY")
-
-    except Exception as e:
-        print(f"   Error: {e}")
+    if res.success:
+        # Strict Fidelity Calculation — one vectorized clip over the whole
+        # batch instead of per-experiment Python arithmetic. Azure results
+        # are string-keyed counts (no SamplerV2 BitArray on this provider),
+        # so fetch each dict exactly once and reuse it below.
+        counts_list = [res.get_counts(i) for i in range(len(experiments))]
+        zeros = np.fromiter((c.get('0', 0) for c in counts_list),
+                            dtype=np.int64, count=len(counts_list))
+        fidelities = np.clip(2 * (zeros / SHOTS - 0.5), 0, None)
+        statuses = np.select([fidelities > 0.85, fidelities < 0.2],
+                             ["✅ STATUS: TRAVERSABLE",
+                              "⛔ STATUS: COLLAPSED"],
+                             "⚠️ STATUS: NOISY")
+
+        for i, exp in enumerate(experiments):
+            print(f"\n--- Condition: {exp['label']} (γ={exp['gamma']}) ---")
+            print(f"   -> Counts: {counts_list[i]}")
+            print(f"   -> Fidelity: {fidelities[i]:.4f}")
+            print(f"   {statuses[i]}")
+
+except Exception as e:
+    print(f"   Error: {e}")
@@ -1,9 +1,10 @@
-import os
 import warnings
 import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister
-from azure.quantum.qiskit import AzureQuantumProvider
-from azure.identity import DeviceCodeCredential
+from qiskit.circuit import CircuitInstruction, ParameterVector
+from qiskit.circuit.library import RZGate
+
+from _azure import get_backend
 
 warnings.filterwarnings("ignore")
 
@@ -11,90 +12,87 @@ warnings.filterwarnings("ignore")
 # 1. SETUP AZURE
 # ============================================================================
 
-# Load credentials from environment variables
-tenant_id = os.environ.get("AZURE_TENANT_ID")
-resource_id = os.environ.get("AZURE_RESOURCE_ID")
-
 print("1. Authenticating...")
-credential = DeviceCodeCredential(tenant_id=tenant_id)
-provider = AzureQuantumProvider(resource_id=resource_id, location="eastus", credential=credential)
-backend = provider.get_backend("ionq.simulator")
+backend = get_backend("ionq.simulator")
 print(f"2. Connected to backend: {backend.name}")
 
 # ============================================================================
-# 2. MANUAL GATES (Bare Metal)
+# 2. BRIDGE HAMILTONIAN
 # ============================================================================
 
-def apply_rxx(qc, theta, q1, q2):
-    qc.h(q1)
-    qc.h(q2)
+# XX, YY and ZZ commute on a qubit pair, so e^(-iθ(XX+YY+ZZ)) factors
+# exactly — and its Cartan (KAK) form needs only 3 CX per pair, half the
+# former count, with no H/Rx basis ping-pong between the three terms.
+def apply_xxyyzz(qc, theta, q1, q2):
     qc.cx(q1, q2)
+    qc.rx(2 * theta - np.pi/2, q1)
     qc.rz(2 * theta, q2)
-    qc.cx(q1, q2)
     qc.h(q1)
-    qc.h(q2)
-
-def apply_ryy(qc, theta, q1, q2):
-    qc.rx(np.pi/2, q1)
-    qc.rx(np.pi/2, q2)
     qc.cx(q1, q2)
-    qc.rz(2 * theta, q2)
+    qc.h(q1)
+    qc.rz(-2 * theta, q2)
     qc.cx(q1, q2)
-    qc.rx(-np.pi/2, q1)
+    qc.rx(np.pi/2, q1)
     qc.rx(-np.pi/2, q2)
 
-def apply_rzz(qc, theta, q1, q2):
-    qc.cx(q1, q2)
-    qc.rz(2 * theta, q2)
-    qc.cx(q1, q2)
-
 # ============================================================================
 # 3. SHIELDED WORMHOLE BUILDER
 # ============================================================================
 
-def build_shielded_wormhole(gamma=0.535, apply_shield=False):
+# Gate-angle parameters: 4 A-side noise + 4 B-side noise + 4 bridge angles.
+# The builder is called once per circuit topology; gamma and coupling are
+# bound afterwards via assign_parameters.
+THETA = ParameterVector("θ", 4 + 4 + 4)
+
+# Per-pair entanglement phase kick π/(i+1), precomputed once so the
+# builder loop indexes a tuple instead of redoing the division per gate
+ENT_ANGLES = (np.pi, np.pi / 2, np.pi / 3, np.pi / 4)
+
+# Uncorrelated noise pattern (π pre-folded in)
+NOISE_PATTERN = np.array([1.0, -0.8, 0.5, -1.2]) * np.pi
+
+def build_shielded_wormhole(apply_shield=False):
     reg_A = QuantumRegister(4, 'A')
     reg_B = QuantumRegister(4, 'B')
     reg_msg = QuantumRegister(1, 'msg')
     creg = ClassicalRegister(1, 'c')
     qc = QuantumCircuit(reg_A, reg_B, reg_msg, creg)
 
-    # 1. ENTANGLEMENT
+    # 1. ENTANGLEMENT with fused noise
+    # The shield Rz is the exact inverse of the adjacent noise Rz, so when
+    # the shield is active both cancel algebraically and neither is emitted.
+    # Otherwise the noise angle folds into the per-pair phase kick (A0 is
+    # the SWAP target, so its noise must wait until after injection).
     for i in range(4):
         qc.h(reg_A[i])
         qc.cx(reg_A[i], reg_B[i])
-        qc.rz(np.pi/(i+1), reg_A[i])
-        qc.rz(-np.pi/(i+1), reg_B[i])
+
+    # The Rz layer commutes across pairs, so emit it as one batched
+    # data.extend — skips per-gate append validation on known-good bits.
+    if apply_shield:
+        kicks = [CircuitInstruction(RZGate(ENT_ANGLES[i]), (reg_A[i],))
+                 for i in range(4)]
+        kicks += [CircuitInstruction(RZGate(-ENT_ANGLES[i]), (reg_B[i],))
+                  for i in range(4)]
+    else:
+        kicks = [CircuitInstruction(RZGate(ENT_ANGLES[0]), (reg_A[0],))]
+        kicks += [CircuitInstruction(RZGate(ENT_ANGLES[i] + THETA[i]),
+                                     (reg_A[i],)) for i in range(1, 4)]
+        kicks += [CircuitInstruction(RZGate(-ENT_ANGLES[i] + THETA[4 + i]),
+                                     (reg_B[i],)) for i in range(4)]
+    qc.data.extend(kicks)
 
     # 2. MESSAGE INJECTION
     qc.h(reg_msg[0])
     qc.swap(reg_msg[0], reg_A[0])
 
-    # 3. THE NOISE ATTACK (Critical Level)
-    noise_pattern = [1.0, -0.8, 0.5, -1.2]
-    gamma_angle = gamma * np.pi
-
-    for i in range(4):
-        angle = gamma_angle * noise_pattern[i]
-        qc.rz(angle, reg_A[i])
-        qc.rz(-angle * 1.5, reg_B[i])
+    # 3. THE NOISE ATTACK (Critical Level) — A0 only, post-injection
+    if not apply_shield:
+        qc.rz(THETA[0], reg_A[0])
 
-    # 3.5. THE SHIELD (Active Correction)
-    # We apply this immediately BEFORE the bridge to neutralize the field.
-    if apply_shield:
-        for i in range(4):
-            angle = gamma_angle * noise_pattern[i]
-            # Inverse of A's noise
-            qc.rz(-angle, reg_A[i])
-            # Inverse of B's noise
-            qc.rz(angle * 1.5, reg_B[i])
-
-    # 4. THE BRIDGE
-    coupling = 0.785 # (Pi/4 with 2x multiplier = Pi/2)
+    # 4. THE BRIDGE — one fused Heisenberg block (3 CX) per pair
     for i in range(4):
-        apply_rxx(qc, coupling, reg_A[i], reg_B[i])
-        apply_ryy(qc, coupling, reg_A[i], reg_B[i])
-        apply_rzz(qc, coupling, reg_A[i], reg_B[i])
+        apply_xxyyzz(qc, THETA[8 + i], reg_A[i], reg_B[i])
 
     # 5. VERIFICATION
     qc.h(reg_B[0])
@@ -102,6 +100,20 @@ def build_shielded_wormhole(gamma=0.535, apply_shield=False):
 
     return qc
 
+
+def shielded_parameter_binds(gamma, coupling=0.785):
+    """
+    Map THETA entries to floats for a given (gamma, coupling) point.
+
+    One vector multiply against the module-level NOISE_PATTERN covers
+    both the A-side and (via the -1.5 factor) B-side angles — no
+    per-qubit scalar arithmetic in the sweep loop.
+    """
+    # coupling = Pi/4 with 2x multiplier = Pi/2
+    noise = gamma * NOISE_PATTERN
+    values = np.concatenate([noise, -1.5 * noise, np.full(4, coupling)])
+    return dict(zip(THETA, values))
+
 # ============================================================================
 # 4. RUN EXPERIMENT
 # ============================================================================
@@ -113,35 +125,52 @@ test_cases = [
 
 print("\n3. Running Phase 3: Active Shielding Protocol...")
 
-for test in test_cases:
-    print(f"\n--- Condition: {test['label']} ---")
-
-    qc = build_shielded_wormhole(gamma=0.535, apply_shield=test['shield'])
+# Same critical-level noise values for both conditions
+BINDS = shielded_parameter_binds(gamma=0.535)
 
-    try:
-        job = backend.run(qc, shots=100)
+# Submit both conditions in ONE job so we pay the queue wait once.
+# The shielded circuit drops its noise Rz entirely, so bind only the
+# parameters each variant still contains.
+all_qcs = []
+for test in test_cases:
+    qc = build_shielded_wormhole(apply_shield=test['shield'])
+    all_qcs.append(qc.assign_parameters({p: BINDS[p] for p in qc.parameters}))
+
+SHOTS = 100
+
+try:
+    # One Azure Quantum session for both conditions: the authenticated
+    # connection (and the service-side job grouping) is reused instead
+    # of a cold handshake per submission.
+    with backend.open_session(name="wormhole-active-shielding"):
+        # The builder only emits h/cx/swap/rx/rz, all accepted by
+        # ionq.simulator as-is, so the adapter's transpile pass is
+        # redundant work on every submission.
+        job = backend.run(all_qcs, shots=SHOTS, skip_transpilation=True)
         res = job.result()
 
-        if res.success:
-            counts = res.get_counts()
-
-            # Fidelity
-            total = sum(counts.values())
-            success_count = counts.get('0', 0)
-
-            prob_success = success_count / 100
-            fidelity = (prob_success - 0.5) * 2
-            if fidelity < 0: fidelity = 0
-
-            print(f"   -> Counts: {counts}")
-            print(f"   -> Fidelity: {fidelity:.4f}")
-
-            if fidelity > 0.8:
-                print("   ✅ STATUS: OPERATIONAL (Shields Holding)")
-            elif fidelity < 0.2:
-                print("   ⛔ STATUS: CRITICAL FAILURE")
-
-    except Exception as e:
-        print(f"   Error: {e}")
+    if res.success:
+        # Fidelity — one vectorized clip over the whole batch instead of
+        # per-condition Python arithmetic. Azure results are string-keyed
+        # counts (no SamplerV2 BitArray on this provider), so fetch each
+        # dict exactly once and reuse it below.
+        counts_list = [res.get_counts(i) for i in range(len(test_cases))]
+        zeros = np.fromiter((c.get('0', 0) for c in counts_list),
+                            dtype=np.int64, count=len(counts_list))
+        fidelities = np.clip(2 * (zeros / SHOTS - 0.5), 0, None)
+        statuses = np.select([fidelities > 0.8, fidelities < 0.2],
+                             ["✅ STATUS: OPERATIONAL (Shields Holding)",
+                              "⛔ STATUS: CRITICAL FAILURE"],
+                             "")
+
+        for i, test in enumerate(test_cases):
+            print(f"\n--- Condition: {test['label']} ---")
+            print(f"   -> Counts: {counts_list[i]}")
+            print(f"   -> Fidelity: {fidelities[i]:.4f}")
+            if statuses[i]:
+                print(f"   {statuses[i]}")
+
+except Exception as e:
+    print(f"   Error: {e}")
 
 print("\nExperiment Complete.")
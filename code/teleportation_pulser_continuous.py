@@ -19,12 +19,37 @@ Device constraints (AnalogDevice)
   • max |Δ|: 125.66 rad/µs,  max Ω: 12.57 rad/µs
 """
 
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 from pulser import Sequence, Register, Pulse
 from pulser.devices import AnalogDevice
 from pulser.waveforms import ConstantWaveform
 import matplotlib.pyplot as plt
 
+# Optional Numba kernel for the sampling reduction — worthwhile for large
+# N_samples / atom counts; the NumPy fallback in run_simulation is used
+# when Numba is not installed.
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _weighted_popcount(bits, cnts):
+        """Σ popcount(bits[i]) * cnts[i] over packed-uint16 bitstrings."""
+        tot = 0
+        for i in range(bits.size):
+            x = bits[i]
+            while x:              # Kernighan: one iteration per set bit
+                x &= x - 1
+                tot += cnts[i]
+        return tot
+except ImportError:
+    _weighted_popcount = None
+
 
 # ============================================================================
 # 1.  REGISTER  —  fits inside 38 µm radial envelope
@@ -32,14 +57,88 @@ import matplotlib.pyplot as plt
 
 from pulser.register.special_layouts import TriangularLatticeLayout
 
-# ============================================================================
-# 1.  REGISTER  —  fits inside 38 µm radial envelope
-# ============================================================================
 
+@lru_cache(maxsize=4)
+def _triangular_hex_layout(n_points: int = 61, spacing: float = 5.0):
+    """
+    Vectorized replica of TriangularLatticeLayout(n_points, spacing).
+
+    FRESNEL requires a register linked to a RegisterLayout whose hash
+    matches the device's lattice, so the coordinates (and their ORDER —
+    trap IDs follow input order) must replicate
+    pulser.register._patterns.triangular_hex exactly. The class itself
+    hangs in Python 3.14, hence the manual build; the former 3-level
+    list comprehension is replaced by one broadcast over
+    (layer, side, atom) indices, and the layout is cached so every γ
+    sweep point reuses the same object instead of re-hashing 61 coords.
+    """
+    from pulser.register.register_layout import RegisterLayout
+
+    crest_y = np.sqrt(3) / 2.0
+    layers = int((-3.0 + np.sqrt(9 + 12 * (n_points - 1))) / 6.0)
+    points_left = n_points - 1 - (layers**2 + layers) * 3
+
+    start_x = np.array([-1.0, -0.5, 0.5, 1.0, 0.5, -0.5])
+    start_y = np.array([0.0, crest_y, crest_y, 0, -crest_y, -crest_y])
+    delta_x = np.array([0.5, 1.0, 0.5, -0.5, -1.0, -0.5])
+    delta_y = np.array([crest_y, 0.0, -crest_y, -crest_y, 0.0, crest_y])
+
+    # Full layers: one (layer, side, atom) grid, masked to atom ≤ layer
+    layer, side, atom = np.meshgrid(np.arange(1, layers + 1), np.arange(6),
+                                    np.arange(1, layers + 1), indexing="ij")
+    mask = atom <= layer
+    coords = np.column_stack(
+        ((start_x[side] * layer + atom * delta_x[side])[mask],
+         (start_y[side] * layer + atom * delta_y[side])[mask]))
+
+    if points_left > 0:
+        layer2 = layers + 1
+        min_atoms_per_side = points_left // 6
+        points_left %= 6
+        sides_order = np.array([0, 3, 1, 4, 2, 5])
+        per_side = np.where(points_left > sides_order,
+                            min_atoms_per_side + 1, min_atoms_per_side)
+        side2, atom2 = np.meshgrid(np.arange(6),
+                                   np.arange(1, per_side.max() + 1),
+                                   indexing="ij")
+        mask2 = atom2 <= per_side[:, None]
+        coords2 = np.column_stack(
+            ((start_x[side2] * layer2 + atom2 * delta_x[side2])[mask2],
+             (start_y[side2] * layer2 + atom2 * delta_y[side2])[mask2]))
+        coords = np.concatenate((coords, coords2))
+
+    # Add center (0,0) at index 0
+    coords = np.concatenate((np.zeros((1, 2)), coords))
+    coords *= spacing
+
+    # RegisterLayout construction hashes every coordinate for device
+    # compatibility; cache the finished object on disk keyed by the
+    # coordinates so later runs unpickle instead of re-hashing.
+    cache_dir = os.path.join(os.path.dirname(__file__), '..', 'cache')
+    cache_path = os.path.join(
+        cache_dir, f"layout_{hashlib.sha256(coords.tobytes()).hexdigest()[:16]}.pkl")
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    # Correct slug so the device-compatibility hash matches
+    layout = RegisterLayout(
+        coords, slug=f"TriangularLatticeLayout({n_points}, {spacing}µm)")
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        pickle.dump(layout, f)
+    return layout
+
+
+@lru_cache(maxsize=2)
 def build_wormhole_register(r_pair: float = 6.0, r_sep: float = 8.0, use_fresnel_layout: bool = False):
     """
     9 atoms: Message (M) + 4 Alice-Bob pairs.
-    
+
+    The geometry does not depend on γ, so the register is memoized and
+    shared across a whole sweep.
+
+
     If use_fresnel_layout=True:
         Uses the hardware-enforced TriangularLatticeLayout (spacing=5µm).
         Selects 9 atoms in a compact cluster to ensure blockade connectivity.
@@ -48,58 +147,11 @@ def build_wormhole_register(r_pair: float = 6.0, r_sep: float = 8.0, use_fresnel
         Custom coordinates (M at origin, pairs along x-axis).
     """
     if use_fresnel_layout:
-        # FRESNEL requires a register linked to a RegisterLayout.
-        # We must REPLICATE exact coordinates of TriangularLatticeLayout(61, 5.0)
-        # to match the device hash. "TriangularLatticeLayout" class hangs in 
-        # Python 3.14 so we build it manually.
-        from pulser.register.register_layout import RegisterLayout
-        
-        spacing = 5.0
-        n_points = 61
-        crest_y = np.sqrt(3) / 2.0
-        
-        # Logic from pulser.register._patterns.triangular_hex(61)
-        layers = int((-3.0 + np.sqrt(9 + 12 * (n_points - 1))) / 6.0)
-        points_left = n_points - 1 - (layers**2 + layers) * 3
-
-        start_x = [-1.0, -0.5, 0.5, 1.0, 0.5, -0.5]
-        start_y = [0.0, crest_y, crest_y, 0, -crest_y, -crest_y]
-        delta_x = [0.5, 1.0, 0.5, -0.5, -1.0, -0.5]
-        delta_y = [crest_y, 0.0, -crest_y, -crest_y, 0.0, crest_y]
-
-        coords = np.array([
-            (start_x[side] * layer + atom * delta_x[side],
-             start_y[side] * layer + atom * delta_y[side])
-            for layer in range(1, layers + 1)
-            for side in range(6)
-            for atom in range(1, layer + 1)
-        ], dtype=float)
-
-        if points_left > 0:
-            layer = layers + 1
-            min_atoms_per_side = points_left // 6
-            points_left %= 6
-            sides_order = [0, 3, 1, 4, 2, 5]
-            coords2 = np.array([
-                (start_x[side] * layer + atom * delta_x[side],
-                 start_y[side] * layer + atom * delta_y[side])
-                for side in range(6)
-                for atom in range(1,
-                    (min_atoms_per_side + 2 if points_left > sides_order[side]
-                     else min_atoms_per_side + 1))
-            ], dtype=float)
-            coords = np.concatenate((coords, coords2))
-            
-        # Add center (0,0) at index 0
-        coords = np.concatenate((np.zeros((1, 2)), coords))
-        coords *= spacing
-
-        # Create Layout with correct slug for hash
-        layout = RegisterLayout(coords, slug=f"TriangularLatticeLayout({n_points}, {spacing}µm)")
-        
+        layout = _triangular_hex_layout(n_points=61, spacing=5.0)
+
         # Select 9 central atoms: Index 0 (center) + 1-6 (Ring 1) + 7-8 (Start of Ring 2)
         central_ids = [0, 1, 2, 3, 4, 5, 6, 7, 8]
-        
+
         reg = layout.define_register(
             *central_ids,
             qubit_ids=[f"q{i}" for i in range(9)]
@@ -129,24 +181,21 @@ def build_wormhole_register(r_pair: float = 6.0, r_sep: float = 8.0, use_fresnel
 # 2.  SEQUENCE BUILDER
 # ============================================================================
 
-def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_layout: bool = False):
-    """
-    Build a Pulser ``Sequence`` compatible with **AnalogDevice**.
+@lru_cache(maxsize=64)
+def _const_wf(duration: int, value: float):
+    """Cached ConstantWaveform — identical waveforms are validated once."""
+    return ConstantWaveform(duration, value)
 
-    Parameters
-    ----------
-    gamma : float
-        CFD decoherence parameter (0 → vacuum, ≥ 0.535 → collapse).
-        Mapped linearly to global detuning Δ.
-    coupling_time : int
-        Duration of the Hamiltonian evolution pulse in **ns**.
-        Must be a multiple of 4 and ≥ 16.
-    use_fresnel_layout : bool
-        If True, uses TriangularLatticeLayout for FRESNEL compatibility.
+
+@lru_cache(maxsize=8)
+def _parametric_wormhole_sequence(coupling_time: int, use_fresnel_layout: bool):
     """
-    # --- enforce clock-period constraint ---
-    coupling_time = max(16, int(round(coupling_time / 4)) * 4)
+    Sequence skeleton shared across a γ sweep.
 
+    Only the detuning depends on γ, so γ is a declared Pulser variable
+    and everything else (register, channel declaration, AnalogDevice
+    validation) is built and validated exactly once.
+    """
     reg = build_wormhole_register(use_fresnel_layout=use_fresnel_layout)
     seq = Sequence(reg, AnalogDevice)
 
@@ -158,9 +207,12 @@ def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_
 
     # --- Detuning encodes the CFD field ---
     delta_max = 40.0     # rad/µs  (well below 125.6 limit)
-    delta = -gamma * delta_max   # negative Δ → suppresses Rydberg excitation
+    gamma_var = seq.declare_variable("gamma", dtype=float)
+    delta = -gamma_var * delta_max  # negative Δ → suppresses Rydberg excitation
 
-    amp_wf = ConstantWaveform(coupling_time, omega)
+    # The detuning waveform holds the γ variable, so only the amplitude
+    # waveform is a plain constant eligible for the cache.
+    amp_wf = _const_wf(coupling_time, omega)
     det_wf = ConstantWaveform(coupling_time, delta)
 
     pulse = Pulse(amplitude=amp_wf, detuning=det_wf, phase=0.0)
@@ -175,14 +227,74 @@ def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_
     return seq
 
 
+def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_layout: bool = False):
+    """
+    Build a Pulser ``Sequence`` compatible with **AnalogDevice**.
+
+    Parameters
+    ----------
+    gamma : float
+        CFD decoherence parameter (0 → vacuum, ≥ 0.535 → collapse).
+        Mapped linearly to global detuning Δ.
+    coupling_time : int
+        Duration of the Hamiltonian evolution pulse in **ns**.
+        Must be a multiple of 4 and ≥ 16.
+    use_fresnel_layout : bool
+        If True, uses TriangularLatticeLayout for FRESNEL compatibility.
+    """
+    # --- enforce clock-period constraint ---
+    coupling_time = max(16, int(round(coupling_time / 4)) * 4)
+
+    # Bind γ into the cached parametric skeleton
+    skeleton = _parametric_wormhole_sequence(coupling_time, use_fresnel_layout)
+    return skeleton.build(gamma=gamma)
+
+
 # ============================================================================
 # 3.  LOCAL SIMULATION  (QuTiP emulator, for validation)
 # ============================================================================
 
-def run_simulation(gamma_values=None):
-    """Run a local sweep and print mean Rydberg density per γ."""
+def _mean_rydberg_density(sampling, n_samples=1000):
+    """
+    Mean Rydberg density from a bitstring counter.
+
+    Bitstrings are packed into uint16 once; the reduction is either a
+    Numba kernel or a POPCNT + dot product in C — never an interpreted
+    generator over up to 2⁹ outcomes.
+    """
+    bits = np.fromiter((int(bs, 2) for bs in sampling),
+                       dtype=np.uint16, count=len(sampling))
+    cnts = np.fromiter(sampling.values(), dtype=np.int64,
+                       count=len(sampling))
+    n_qubits = len(next(iter(sampling)))
+    if _weighted_popcount is not None:
+        total_exc = _weighted_popcount(bits, cnts)
+    else:
+        pops = np.fromiter((int(b).bit_count() for b in bits),
+                           dtype=np.int64, count=bits.size)
+        total_exc = pops.dot(cnts)
+    return total_exc / (n_qubits * n_samples)
+
+
+def _simulate_gamma(g):
+    """Worker: one independent, compute-bound QuTiP simulation."""
     from pulser_simulation import QutipEmulator
 
+    seq = build_wormhole_sequence(gamma=g, coupling_time=500)
+
+    # Only the final state is sampled, so don't store the state history
+    # at every ODE timestep, and loosen the solver tolerances to well
+    # below the 1000-sample shot noise.
+    sim = QutipEmulator.from_sequence(seq, evaluation_times="Minimal")
+    res = sim.run(nsteps=10000, atol=1e-6, rtol=1e-4)
+
+    # Mean Rydberg density as traversability proxy
+    sampling = res.sample_final_state(N_samples=1000)
+    return g, _mean_rydberg_density(sampling)
+
+
+def run_simulation(gamma_values=None):
+    """Run a local sweep and print mean Rydberg density per γ."""
     if gamma_values is None:
         gamma_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.535, 0.8]
 
@@ -190,22 +302,13 @@ def run_simulation(gamma_values=None):
     print(f"{'γ':<8} | {'⟨n⟩  (mean Rydberg density)':<35}")
     print("-" * 50)
 
-    results = {}
+    # The γ points are independent and QuTiP's ODE solver holds the GIL
+    # inside its SciPy stack, so only process-based parallelism scales.
+    with ProcessPoolExecutor() as pool:
+        results = dict(pool.map(_simulate_gamma, gamma_values))
 
     for g in gamma_values:
-        seq = build_wormhole_sequence(gamma=g, coupling_time=500)
-
-        sim = QutipEmulator.from_sequence(seq)
-        res = sim.run()
-
-        # Mean Rydberg density as traversability proxy
-        sampling = res.sample_final_state(N_samples=1000)
-        avg_exc = sum(
-            bs.count("1") / len(bs) * n for bs, n in sampling.items()
-        ) / 1000
-
-        results[g] = avg_exc
-        print(f"{g:<8.3f} | {avg_exc:.4f}")
+        print(f"{g:<8.3f} | {results[g]:.4f}")
 
     return results
 
@@ -0,0 +1,73 @@
+"""
+Content-Addressed Batch Cache
+=============================
+Maps sha256(serialized sequence + runs + device) → Pasqal Cloud batch
+id in a local shelve store, so resubmitting an experiment whose
+sequence has not changed short-circuits to fetching the existing batch
+instead of queueing (and, on the QPU, paying for) a duplicate run.
+
+The store lives next to the serialized-sequence cache under
+pasqal_native/cache/ and survives across script runs.
+"""
+
+import hashlib
+import json
+import os
+import shelve
+import threading
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
+DB_PATH = os.path.join(CACHE_DIR, 'batches')
+
+# shelve is not safe for concurrent access; the lock covers only the
+# store lookups/updates, so the HTTP calls still overlap across threads.
+_DB_LOCK = threading.Lock()
+
+
+def _db_get(key):
+    with _DB_LOCK:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with shelve.open(DB_PATH) as db:
+            return db.get(key)
+
+
+def _db_put(key, value):
+    with _DB_LOCK:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with shelve.open(DB_PATH) as db:
+            db[key] = value
+
+
+def lookup_or_submit(sdk, serialized: str, runs: int, device_type: str,
+                     jobs: list[dict] | None = None):
+    """Return a batch for (sequence, jobs, device), reusing a previous
+    submission when nothing semantically changed.
+
+    ``jobs`` defaults to a single job of ``runs`` shots; a caller can
+    pass an explicit job list (e.g. one job per γ binding for a
+    parametric sequence) and the whole list becomes part of the key.
+
+    On a cache hit the cached batch id is re-fetched from the cloud; if
+    that fails (batch expired or deleted project-side) the entry is
+    treated as a miss and the sequence is submitted fresh.
+    """
+    if jobs is None:
+        jobs = [{"runs": runs}]
+    key = hashlib.sha256(
+        f"{device_type}:{json.dumps(jobs, sort_keys=True)}:{serialized}"
+        .encode()).hexdigest()
+
+    batch_id = _db_get(key)
+    if batch_id is not None:
+        try:
+            return sdk.get_batch(batch_id)
+        except Exception:
+            pass
+
+    batch = sdk.create_batch(
+        serialized_sequence=serialized,
+        jobs=jobs,
+        device_type=device_type,
+    )
+    _db_put(key, batch.id)
+    return batch
@@ -19,12 +19,37 @@ Device constraints (AnalogDevice)
   • max |Δ|: 125.66 rad/µs,  max Ω: 12.57 rad/µs
 """
 
+import hashlib
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import numpy as np
 from pulser import Sequence, Register, Pulse
 from pulser.devices import AnalogDevice
 from pulser.waveforms import ConstantWaveform
 import matplotlib.pyplot as plt
 
+# Optional Numba kernel for the sampling reduction — worthwhile for large
+# N_samples / atom counts; the NumPy fallback in run_simulation is used
+# when Numba is not installed.
+try:
+    from numba import njit
+
+    @njit(cache=True)
+    def _weighted_popcount(bits, cnts):
+        """Σ popcount(bits[i]) * cnts[i] over packed-uint16 bitstrings."""
+        tot = 0
+        for i in range(bits.size):
+            x = bits[i]
+            while x:              # Kernighan: one iteration per set bit
+                x &= x - 1
+                tot += cnts[i]
+        return tot
+except ImportError:
+    _weighted_popcount = None
+
 
 # ============================================================================
 # 1.  REGISTER  —  fits inside 38 µm radial envelope
@@ -32,14 +57,54 @@ import matplotlib.pyplot as plt
 
 from pulser.register.special_layouts import TriangularLatticeLayout
 
-# ============================================================================
-# 1.  REGISTER  —  fits inside 38 µm radial envelope
-# ============================================================================
 
+@lru_cache(maxsize=1)
+def _fresnel_grid_layout(spacing: float = 5.0):
+    """
+    Shared triangular-grid RegisterLayout for FRESNEL.
+
+    Layout construction triggers coordinate hashing for device
+    compatibility, so build it once at first use and let every register
+    definition reuse the same object. (TriangularLatticeLayout hangs in
+    Python 3.14, hence the manual 5×5 grid.)
+    """
+    from pulser.register.register_layout import RegisterLayout
+
+    dy = spacing * np.sqrt(3) / 2
+    # One broadcast over the (row, col) grid instead of 25 Python-level
+    # tuple appends; trap IDs keep the row-major order of the old loop.
+    row, col = np.mgrid[0:5, 0:5]
+    x = col * spacing + (row % 2) * (spacing / 2)
+    y = row * dy
+    traps = np.column_stack((x.ravel(), y.ravel())).astype(float)
+    traps -= traps.mean(axis=0)            # centre of mass at origin
+
+    # RegisterLayout hashes every trap coordinate on construction;
+    # cache the finished object on disk keyed by the coordinates so
+    # later runs unpickle instead of re-hashing.
+    cache_dir = os.path.join(os.path.dirname(__file__), '..', 'cache')
+    cache_path = os.path.join(
+        cache_dir, f"layout_{hashlib.sha256(traps.tobytes()).hexdigest()[:16]}.pkl")
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    layout = RegisterLayout(traps)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(cache_path, 'wb') as f:
+        pickle.dump(layout, f)
+    return layout
+
+
+@lru_cache(maxsize=2)
 def build_wormhole_register(r_pair: float = 6.0, r_sep: float = 8.0, use_fresnel_layout: bool = False):
     """
     9 atoms: Message (M) + 4 Alice-Bob pairs.
-    
+
+    The geometry does not depend on γ, so the register is memoized and
+    shared across a whole sweep.
+
+
     If use_fresnel_layout=True:
         Uses the hardware-enforced TriangularLatticeLayout (spacing=5µm).
         Selects 9 atoms in a compact cluster to ensure blockade connectivity.
@@ -49,22 +114,10 @@ def build_wormhole_register(r_pair: float = 6.0, r_sep: float = 8.0, use_fresnel
     """
     if use_fresnel_layout:
         # FRESNEL requires a register linked to a RegisterLayout.
-        # We manually build a triangular lattice (TriangularLatticeLayout hangs
-        # in Python 3.14). A 5x5 grid at 5µm spacing gives 25 traps; we pick
-        # 9 central atoms for our wormhole qubits.
-        from pulser.register.register_layout import RegisterLayout
-        spacing = 5.0   # µm  (matches AnalogDevice.min_atom_distance)
-        dy = spacing * np.sqrt(3) / 2
-        traps = []
-        for row in range(5):
-            for col in range(5):
-                x = col * spacing + (spacing / 2 if row % 2 else 0)
-                y = row * dy
-                traps.append((x, y))
-        traps = np.array(traps)
-        traps -= traps.mean(axis=0)            # centre of mass at origin
-
-        layout = RegisterLayout(traps)
+        # The 5x5 grid at 5µm spacing gives 25 traps; we pick 9 central
+        # atoms for our wormhole qubits (register definition is cheap —
+        # the layout itself is shared, see _fresnel_grid_layout).
+        layout = _fresnel_grid_layout(spacing=5.0)
         # Central 3×3 block:  rows 1-3, cols 1-3  →  IDs 6-8, 11-13, 16-18
         central_ids = [6, 7, 8, 11, 12, 13, 16, 17, 18]
         reg = layout.define_register(
@@ -96,24 +149,21 @@ def build_wormhole_register(r_pair: float = 6.0, r_sep: float = 8.0, use_fresnel
 # 2.  SEQUENCE BUILDER
 # ============================================================================
 
-def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_layout: bool = False):
-    """
-    Build a Pulser ``Sequence`` compatible with **AnalogDevice**.
+@lru_cache(maxsize=64)
+def _const_wf(duration: int, value: float):
+    """Cached ConstantWaveform — identical waveforms are validated once."""
+    return ConstantWaveform(duration, value)
 
-    Parameters
-    ----------
-    gamma : float
-        CFD decoherence parameter (0 → vacuum, ≥ 0.535 → collapse).
-        Mapped linearly to global detuning Δ.
-    coupling_time : int
-        Duration of the Hamiltonian evolution pulse in **ns**.
-        Must be a multiple of 4 and ≥ 16.
-    use_fresnel_layout : bool
-        If True, uses TriangularLatticeLayout for FRESNEL compatibility.
+
+@lru_cache(maxsize=8)
+def _parametric_wormhole_sequence(coupling_time: int, use_fresnel_layout: bool):
     """
-    # --- enforce clock-period constraint ---
-    coupling_time = max(16, int(round(coupling_time / 4)) * 4)
+    Sequence skeleton shared across a γ sweep.
 
+    Only the detuning depends on γ, so γ is a declared Pulser variable
+    and everything else (register, channel declaration, AnalogDevice
+    validation) is built and validated exactly once.
+    """
     reg = build_wormhole_register(use_fresnel_layout=use_fresnel_layout)
     seq = Sequence(reg, AnalogDevice)
 
@@ -125,9 +175,12 @@ def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_
 
     # --- Detuning encodes the CFD field ---
     delta_max = 40.0     # rad/µs  (well below 125.6 limit)
-    delta = -gamma * delta_max   # negative Δ → suppresses Rydberg excitation
+    gamma_var = seq.declare_variable("gamma", dtype=float)
+    delta = -gamma_var * delta_max  # negative Δ → suppresses Rydberg excitation
 
-    amp_wf = ConstantWaveform(coupling_time, omega)
+    # The detuning waveform holds the γ variable, so only the amplitude
+    # waveform is a plain constant eligible for the cache.
+    amp_wf = _const_wf(coupling_time, omega)
     det_wf = ConstantWaveform(coupling_time, delta)
 
     pulse = Pulse(amplitude=amp_wf, detuning=det_wf, phase=0.0)
@@ -142,14 +195,87 @@ def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_
     return seq
 
 
+def serialize_parametric_sequence(coupling_time: int = 500,
+                                  use_fresnel_layout: bool = False) -> str:
+    """Abstract repr of the UNBUILT parametric sequence.
+
+    γ stays a declared Pulser variable in the payload, so one serialized
+    sequence can host a whole sweep as a single cloud batch whose jobs
+    each bind their own γ via job variables.
+    """
+    coupling_time = max(16, int(round(coupling_time / 4)) * 4)
+    skeleton = _parametric_wormhole_sequence(coupling_time, use_fresnel_layout)
+    return skeleton.to_abstract_repr()
+
+
+def build_wormhole_sequence(gamma: float, coupling_time: int = 500, use_fresnel_layout: bool = False):
+    """
+    Build a Pulser ``Sequence`` compatible with **AnalogDevice**.
+
+    Parameters
+    ----------
+    gamma : float
+        CFD decoherence parameter (0 → vacuum, ≥ 0.535 → collapse).
+        Mapped linearly to global detuning Δ.
+    coupling_time : int
+        Duration of the Hamiltonian evolution pulse in **ns**.
+        Must be a multiple of 4 and ≥ 16.
+    use_fresnel_layout : bool
+        If True, uses TriangularLatticeLayout for FRESNEL compatibility.
+    """
+    # --- enforce clock-period constraint ---
+    coupling_time = max(16, int(round(coupling_time / 4)) * 4)
+
+    # Bind γ into the cached parametric skeleton
+    skeleton = _parametric_wormhole_sequence(coupling_time, use_fresnel_layout)
+    return skeleton.build(gamma=gamma)
+
+
 # ============================================================================
 # 3.  LOCAL SIMULATION  (QuTiP emulator, for validation)
 # ============================================================================
 
-def run_simulation(gamma_values=None):
-    """Run a local sweep and print mean Rydberg density per γ."""
+def _mean_rydberg_density(sampling, n_samples=1000):
+    """
+    Mean Rydberg density from a bitstring counter.
+
+    Bitstrings are packed into uint16 once; the reduction is either a
+    Numba kernel or a POPCNT + dot product in C — never an interpreted
+    generator over up to 2⁹ outcomes.
+    """
+    bits = np.fromiter((int(bs, 2) for bs in sampling),
+                       dtype=np.uint16, count=len(sampling))
+    cnts = np.fromiter(sampling.values(), dtype=np.int64,
+                       count=len(sampling))
+    n_qubits = len(next(iter(sampling)))
+    if _weighted_popcount is not None:
+        total_exc = _weighted_popcount(bits, cnts)
+    else:
+        pops = np.fromiter((int(b).bit_count() for b in bits),
+                           dtype=np.int64, count=bits.size)
+        total_exc = pops.dot(cnts)
+    return total_exc / (n_qubits * n_samples)
+
+
+def _simulate_gamma(g):
+    """Worker: one independent, compute-bound QuTiP simulation."""
     from pulser_simulation import QutipEmulator
 
+    seq = build_wormhole_sequence(gamma=g, coupling_time=500)
+
+    # Only the final state is sampled, so don't store the state history
+    # at every ODE timestep, and loosen the solver tolerances to well
+    # below the 1000-sample shot noise.
+    sim = QutipEmulator.from_sequence(seq, evaluation_times="Minimal")
+    res = sim.run(nsteps=10000, atol=1e-6, rtol=1e-4)
+
+    # Mean Rydberg density as traversability proxy
+    sampling = res.sample_final_state(N_samples=1000)
+    return g, _mean_rydberg_density(sampling)
+
+
+def run_simulation(gamma_values=None):
+    """Run a local sweep and print mean Rydberg density per γ."""
     if gamma_values is None:
         gamma_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.535, 0.8]
 
@@ -157,24 +283,49 @@ def run_simulation(gamma_values=None):
     print(f"{'γ':<8} | {'⟨n⟩  (mean Rydberg density)':<35}")
     print("-" * 50)
 
-    results = {}
+    # The γ points are independent and QuTiP's ODE solver holds the GIL
+    # inside its SciPy stack, so only process-based parallelism scales.
+    with ProcessPoolExecutor() as pool:
+        results = dict(pool.map(_simulate_gamma, gamma_values))
 
     for g in gamma_values:
-        seq = build_wormhole_sequence(gamma=g, coupling_time=500)
+        print(f"{g:<8.3f} | {results[g]:.4f}")
+
+    return results
 
-        sim = QutipEmulator.from_sequence(seq)
-        res = sim.run()
 
-        # Mean Rydberg density as traversability proxy
-        sampling = res.sample_final_state(N_samples=1000)
-        avg_exc = sum(
-            bs.count("1") / len(bs) * n for bs, n in sampling.items()
-        ) / 1000
+# ============================================================================
+# 4.  CORE-QUBIT EXTRACTION  (for QPU registers with spectator atoms)
+# ============================================================================
 
-        results[g] = avg_exc
-        print(f"{g:<8.3f} | {avg_exc:.4f}")
+def extract_core_counts(raw_counts, core_ids, all_qubit_ids):
+    """
+    Marginalize a full-register counts dict onto the core qubits.
 
-    return results
+    The fixed-width bitstring keys are decoded once into a
+    (n_states, n_total) bit matrix, the core columns are packed into
+    integers, and a single np.bincount aggregates the counts — no
+    Python dict-update inner loop, and memory stays bounded at
+    2**n_core regardless of how many raw bitstrings the QPU returned.
+    """
+    if not raw_counts:
+        return {}
+
+    n_total = len(all_qubit_ids)
+    pos = [all_qubit_ids.index(q) for q in core_ids]
+    n_core = len(pos)
+
+    keys = np.array(list(raw_counts), dtype=f'|S{n_total}')
+    vals = np.fromiter(raw_counts.values(), dtype=np.int64,
+                       count=len(raw_counts))
+    bits = keys.view(np.uint8).reshape(-1, n_total) - ord('0')
+
+    place = 1 << np.arange(n_core - 1, -1, -1, dtype=np.int64)
+    packed = bits[:, pos].astype(np.int64) @ place
+    agg = np.bincount(packed, weights=vals, minlength=1 << n_core)
+
+    return {format(i, f'0{n_core}b'): int(agg[i])
+            for i in np.flatnonzero(agg)}
 
 
 if __name__ == "__main__":
@@ -12,9 +12,15 @@ Usage:
 import os
 import sys
 import json
-import glob
 import numpy as np
 
+try:
+    # SIMD-accelerated parser — the raw-counts files can run to
+    # hundreds of MB, where stdlib json stalls.
+    import orjson
+except ImportError:
+    orjson = None
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code'))
 from wormhole_pulser_continuous import extract_core_counts
 
@@ -32,17 +38,42 @@ EMU_FREE_REF = {
 GAMMA_POINTS = [0.05, 0.20, 0.40]
 
 
+def mean_density(counts, n_qubits):
+    """
+    Mean excitation fraction ⟨n⟩ from a counts dict.
+
+    Bitstrings are packed into uint64 once and reduced with one
+    vectorized popcount pass + dot product, instead of a char-by-char
+    bs.count('1') scan per bitstring.
+    """
+    if not counts:
+        return 0.0
+    packed = np.fromiter((int(bs, 2) for bs in counts), dtype=np.uint64,
+                         count=len(counts))
+    vals = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    return float(np.bitwise_count(packed).dot(vals)) / (n_qubits * vals.sum())
+
+
 def load_latest_results():
     """Find the most recent fresnel_can1_*.json (with raw counts)."""
     results_dir = os.path.join(os.path.dirname(__file__), '..', 'results')
-    files = sorted(glob.glob(os.path.join(results_dir, 'fresnel_can1_2*.json')))
-    if not files:
+    # The ISO-8601 timestamp in the name sorts chronologically, so a
+    # running max over the scandir generator finds the latest file in
+    # O(n) time and O(1) memory — no glob pattern matching, no sort,
+    # and no materialized listing however large results/ grows.
+    with os.scandir(results_dir) as it:
+        latest = max((e.path for e in it
+                      if e.name.startswith('fresnel_can1_2')
+                      and e.name.endswith('.json')),
+                     default=None)
+    if latest is None:
         print("ERROR: No fresnel_can1_*.json files found in results/")
         sys.exit(1)
-    latest = files[-1]
     print(f"Loading: {os.path.basename(latest)}")
-    with open(latest) as f:
-        return json.load(f), latest
+    with open(latest, 'rb') as f:
+        data = f.read()
+    return (orjson.loads(data) if orjson is not None
+            else json.loads(data)), latest
 
 
 def analyze():
@@ -91,9 +122,7 @@ def analyze():
         core_shots = sum(core_counts.values())
         ground_9 = "0" * 9
         p0_core = core_counts.get(ground_9, 0) / core_shots if core_shots > 0 else 0
-        rho_core = sum(
-            bs.count("1") / 9 * n for bs, n in core_counts.items()
-        ) / core_shots if core_shots > 0 else 0
+        rho_core = mean_density(core_counts, 9)
         n_core_states = len(core_counts)
 
         print(f"  γ={gamma:.2f}  shots={core_shots}  "
@@ -33,9 +33,13 @@ plt.rcParams.update({
     'xtick.labelsize': 11,
     'ytick.labelsize': 11,
     'legend.fontsize': 11,
-    'figure.dpi': 300,
+    # Figures are rendered once and saved; keep the working canvas at
+    # 150 dpi (rasterization cost scales with dpi²) and only pay 300 dpi
+    # at savefig time for the publication outputs.
+    'figure.dpi': 150,
     'savefig.dpi': 300,
     'savefig.bbox': 'tight',
+    'text.hinting': 'none',   # skip per-glyph hinting in text layout
     'axes.grid': True,
     'grid.alpha': 0.3,
 })
@@ -52,15 +56,60 @@ C_BG        = '#F8FAFC'
 # DATA LOADING
 # ============================================================================
 
+try:
+    # SIMD-accelerated parser — results files carry full raw_counts
+    # dicts and can run to hundreds of MB, where stdlib json stalls.
+    import orjson
+except ImportError:
+    orjson = None
+
+
 def load_results(path: str) -> list[dict]:
-    with open(path) as f:
-        return json.load(f)
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 
 # ============================================================================
 # METRICS COMPUTATION
 # ============================================================================
 
+# ASCII → bit lookup table: decoding a batch of '0'/'1' keys is one
+# L1-resident 256-byte gather, and any stray byte maps to 0 instead of
+# wrapping like a blind `- ord('0')` would.
+_ASCII_BIT = np.zeros(256, dtype=np.uint8)
+_ASCII_BIT[ord('1')] = 1
+
+# Optional Numba kernel fusing all four per-state reductions into one
+# compiled parallel pass. The NumPy branch in compute_metrics remains
+# the fallback when Numba is not installed.
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _metrics_kernel(bits, vals, total):
+        """(⟨n⟩, P₀, entropy, per-qubit excitation) from a bit matrix."""
+        n_states, n_qubits = bits.shape
+        inv_total = 1.0 / total
+        ryd = 0.0
+        ground = 0.0
+        entropy = 0.0
+        exc = np.zeros(n_qubits)
+        for i in prange(n_states):
+            w = vals[i] * inv_total
+            row = 0
+            for j in range(n_qubits):
+                row += bits[i, j]
+            ryd += row * w
+            if row == 0:
+                ground += w
+            entropy -= w * np.log2(w)
+            exc += bits[i, :] * w
+        return ryd / n_qubits, ground, entropy, exc
+except ImportError:
+    _metrics_kernel = None
+
+
 def compute_metrics(results: list[dict]) -> dict:
     """Extract physics from raw count data."""
     metrics = {
@@ -78,29 +127,36 @@ def compute_metrics(results: list[dict]) -> dict:
 
         gamma  = entry['gamma']
         counts = entry['counts']
-        total  = sum(counts.values())
         n_qubits = len(next(iter(counts)))  # bitstring length
 
-        # 1. Mean Rydberg density  <n> = avg fraction of '1's
-        rydberg_sum = sum(
-            bs.count('1') / n_qubits * n for bs, n in counts.items()
-        )
-        rydberg_density = rydberg_sum / total
+        # Decode every bitstring once into a (n_states, n_qubits) 0/1
+        # array; all metrics below become contiguous NumPy reductions
+        # instead of per-bitstring Python string ops.
+        bits = _ASCII_BIT[np.frombuffer(''.join(counts).encode(),
+                                        dtype=np.uint8)].reshape(-1, n_qubits)
+        vals = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+        total = int(vals.sum())
 
-        # 2. Ground state probability
-        ground_prob = counts.get('0' * n_qubits, 0) / total
+        if _metrics_kernel is not None:
+            (rydberg_density, ground_prob,
+             entropy, qubit_exc) = _metrics_kernel(bits, vals, total)
+        else:
+            # Normalize once; every reduction below reuses the same
+            # probability vector instead of dividing by total per metric.
+            probs = vals / total
 
-        # 3. Shannon entropy
-        probs = np.array([n / total for n in counts.values()])
-        entropy = -np.sum(probs * np.log2(probs + 1e-15))
+            # 1. Mean Rydberg density  <n> = avg fraction of '1's
+            rydberg_density = bits.sum(axis=1).dot(probs) / n_qubits
 
-        # 4. Per-qubit excitation
-        qubit_exc = np.zeros(n_qubits)
-        for bs, n in counts.items():
-            for i, bit in enumerate(bs):
-                if bit == '1':
-                    qubit_exc[i] += n
-        qubit_exc /= total
+            # 2. Ground state probability
+            ground_prob = counts.get('0' * n_qubits, 0) / total
+
+            # 3. Shannon entropy — probs comes from observed counts so
+            # every entry is strictly positive; no log(0) guard needed.
+            entropy = -np.sum(probs * np.log2(probs))
+
+            # 4. Per-qubit excitation
+            qubit_exc = bits.T.dot(probs)
 
         metrics['gamma'].append(gamma)
         metrics['rydberg_density'].append(rydberg_density)
@@ -121,11 +177,26 @@ def compute_metrics(results: list[dict]) -> dict:
 # PLOTTING
 # ============================================================================
 
+# Figures 1–3 share one Figure/Axes pair: with the serif font setup,
+# figure construction dominates these small plots, so each function
+# clears and redraws the shared axes instead of building a fresh canvas.
+_PANEL = None
+
+def _single_panel():
+    global _PANEL
+    if _PANEL is None:
+        fig, ax = plt.subplots(figsize=(8, 5))
+        fig.patch.set_facecolor(C_BG)
+        _PANEL = (fig, ax)
+    fig, ax = _PANEL
+    ax.cla()
+    ax.set_facecolor(C_BG)
+    return fig, ax
+
+
 def plot_traversability(metrics: dict, output_dir: str):
     """Fig 1: Mean Rydberg density — traversability proxy."""
-    fig, ax = plt.subplots(figsize=(8, 5))
-    fig.patch.set_facecolor(C_BG)
-    ax.set_facecolor(C_BG)
+    fig, ax = _single_panel()
 
     gamma = metrics['gamma']
     rho   = metrics['rydberg_density']
@@ -144,16 +215,13 @@ def plot_traversability(metrics: dict, output_dir: str):
 
     path = os.path.join(output_dir, 'fig1_traversability.pdf')
     fig.savefig(path)
-    plt.close(fig)
     print(f"  Saved: {path}")
     return path
 
 
 def plot_collapse(metrics: dict, output_dir: str):
     """Fig 2: Ground state probability — collapse indicator."""
-    fig, ax = plt.subplots(figsize=(8, 5))
-    fig.patch.set_facecolor(C_BG)
-    ax.set_facecolor(C_BG)
+    fig, ax = _single_panel()
 
     gamma = metrics['gamma']
     gp    = metrics['ground_prob']
@@ -173,16 +241,13 @@ def plot_collapse(metrics: dict, output_dir: str):
 
     path = os.path.join(output_dir, 'fig2_collapse.pdf')
     fig.savefig(path)
-    plt.close(fig)
     print(f"  Saved: {path}")
     return path
 
 
 def plot_entropy(metrics: dict, output_dir: str):
     """Fig 3: Shannon entropy — state diversity measure."""
-    fig, ax = plt.subplots(figsize=(8, 5))
-    fig.patch.set_facecolor(C_BG)
-    ax.set_facecolor(C_BG)
+    fig, ax = _single_panel()
 
     gamma = metrics['gamma']
     ent   = metrics['entropy']
@@ -201,14 +266,15 @@ def plot_entropy(metrics: dict, output_dir: str):
 
     path = os.path.join(output_dir, 'fig3_entropy.pdf')
     fig.savefig(path)
-    plt.close(fig)
     print(f"  Saved: {path}")
     return path
 
 
 def plot_combined(metrics: dict, output_dir: str):
     """Fig 4: Combined 2×2 panel for manuscript."""
-    fig, axes = plt.subplots(2, 2, figsize=(14, 10))
+    # constrained_layout does its sizing during the draw pass — cheaper
+    # than the separate full layout pass tight_layout runs.
+    fig, axes = plt.subplots(2, 2, figsize=(14, 10), layout='constrained')
     fig.patch.set_facecolor(C_BG)
 
     gamma = metrics['gamma']
@@ -256,41 +322,18 @@ def plot_combined(metrics: dict, output_dir: str):
     for a in axes.flat:
         a.grid(True, alpha=0.2)
 
-    fig.suptitle('System Dynamics under Parametric Dephasing — Pasqal Neutral-Atom Emulation', fontsize=18, y=1.01)
-    fig.tight_layout()
+    fig.suptitle('System Dynamics under Parametric Dephasing — Pasqal Neutral-Atom Emulation', fontsize=18)
 
+    # savefig infers the format from the suffix, so the same rendered
+    # figure serves both the manuscript PDF and the quick-view PNG —
+    # no second layout pass, and the two outputs can't drift apart.
+    # The PNG is a preview: 150 dpi is plenty and rasterizes 4x faster.
     path = os.path.join(output_dir, 'fig4_combined_panel.pdf')
+    png_path = os.path.join(output_dir, 'fig4_combined_panel.png')
     fig.savefig(path)
+    fig.savefig(png_path, dpi=150)
     plt.close(fig)
     print(f"  Saved: {path}")
-
-    # Also save PNG for quick viewing
-    png_path = os.path.join(output_dir, 'fig4_combined_panel.png')
-    fig2, axes2 = plt.subplots(2, 2, figsize=(14, 10))
-    fig2.patch.set_facecolor(C_BG)
-    # Re-draw for PNG
-    ax = axes2[0, 0]; ax.set_facecolor(C_BG)
-    ax.plot(gamma, metrics['rydberg_density'], 'o-', color=C_PRIMARY, lw=2, ms=7, mec='white', mew=1.2)
-    ax.axvline(x=0.535, color=C_CRITICAL, ls='--'); ax.set_xlabel(r'$\gamma$'); ax.set_ylabel(r'$\langle n \rangle$'); ax.set_title('(a) Mean Rydberg Density')
-
-    ax = axes2[0, 1]; ax.set_facecolor(C_BG)
-    ax.plot(gamma, metrics['ground_prob'], 's-', color=C_SECONDARY, lw=2, ms=7, mec='white', mew=1.2)
-    ax.axvline(x=0.535, color=C_CRITICAL, ls='--'); ax.set_xlabel(r'$\gamma$'); ax.set_ylabel(r'$P_0$'); ax.set_title('(b) Ground State Probability')
-
-    ax = axes2[1, 0]; ax.set_facecolor(C_BG)
-    ax.plot(gamma, metrics['entropy'], 'D-', color=C_ACCENT, lw=2, ms=7, mec='white', mew=1.2)
-    ax.axvline(x=0.535, color=C_CRITICAL, ls='--'); ax.set_xlabel(r'$\gamma$'); ax.set_ylabel(r'$S$ (bits)'); ax.set_title('(c) Shannon Entropy')
-
-    ax = axes2[1, 1]
-    im = ax.imshow(qubit_data.T, aspect='auto', cmap='inferno', extent=[min(gamma)-0.025, max(gamma)+0.025, 8.5, -0.5])
-    ax.set_xlabel(r'$\gamma$'); ax.set_ylabel('Qubit Index'); ax.set_title('(d) Per-Qubit Excitation')
-    fig2.colorbar(im, ax=ax, fraction=0.046, pad=0.04).set_label(r'$P(|1\rangle)$')
-
-    for a in axes2.flat: a.grid(True, alpha=0.2)
-    fig2.suptitle('System Dynamics under Parametric Dephasing — Pasqal Neutral-Atom Emulation', fontsize=18, y=1.01)
-    fig2.tight_layout()
-    fig2.savefig(png_path)
-    plt.close(fig2)
     print(f"  Saved: {png_path}")
 
     return path
@@ -13,6 +13,16 @@ import os
 import sys
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+try:
+    # SIMD-accelerated serializer — the full-results file embeds every
+    # raw-counts dict and can run to hundreds of MB.
+    import orjson
+except ImportError:
+    orjson = None
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code'))
 
@@ -105,15 +115,23 @@ def main():
     print(f"  Downloading results for {len(done_batches)} completed batch(es)")
     print(f"{'=' * 70}")
 
+    # The per-batch detail downloads are independent network round
+    # trips, so overlap them with a thread pool; the report loop below
+    # stays sequential and in submission order.
+    with ThreadPoolExecutor(max_workers=min(8, len(done_batches))) as pool:
+        full_batches = list(pool.map(lambda b: sdk.get_batch(b.id),
+                                     done_batches))
+
+    # Summary entries are built inline alongside the full entries, so
+    # the big raw_counts dicts are never copy-filtered out afterwards.
     all_results = []
-    for batch in done_batches:
+    summaries = []
+    for batch, full_batch in zip(done_batches, full_batches):
         print(f"\n  Batch {batch.id}:")
         print(f"    Status:  {batch.status}")
         print(f"    Created: {batch.created_at}")
         print(f"    Updated: {batch.updated_at}")
 
-        # Fetch full batch with jobs
-        full_batch = sdk.get_batch(batch.id)
         jobs = full_batch.ordered_jobs
         print(f"    Jobs:    {len(jobs)}")
 
@@ -126,7 +144,7 @@ def main():
             print(f"    Job {i+1}/{len(jobs)}: id={job.id}  status={job.status}  "
                   f"shots={shots}  qubits={n_qubits}  states={unique_states}")
 
-            result_entry = {
+            summary_entry = {
                 "batch_id": batch.id,
                 "job_id": job.id,
                 "job_index": i,
@@ -137,7 +155,6 @@ def main():
                 "total_shots": shots,
                 "n_qubits": n_qubits,
                 "unique_states": unique_states,
-                "raw_counts": raw_counts,
             }
 
             # If we have result data, compute some basic stats
@@ -146,19 +163,25 @@ def main():
                 ground_state = "0" * n_qubits
                 p_ground = raw_counts.get(ground_state, 0) / shots
 
-                # Mean excitation density
-                rho = sum(
-                    bs.count("1") / n_qubits * count
-                    for bs, count in raw_counts.items()
-                ) / shots
+                # Mean excitation density — decode the fixed-width ASCII
+                # keys once into a bit matrix so one NumPy reduction
+                # replaces the O(states × qubits) Python loop per job.
+                keys = np.array(list(raw_counts), dtype=f'|S{n_qubits}')
+                vals = np.fromiter(raw_counts.values(), dtype=np.int64,
+                                   count=len(raw_counts))
+                bits = keys.view(np.uint8).reshape(-1, n_qubits) - ord('0')
+                rho = float(bits.sum(axis=1).dot(vals)) / (shots * n_qubits)
 
-                result_entry["p_ground"] = p_ground
-                result_entry["mean_rho"] = rho
+                summary_entry["p_ground"] = p_ground
+                summary_entry["mean_rho"] = rho
 
                 print(f"      P(ground) = {p_ground:.4f}  "
                       f"⟨n⟩ = {rho:.4f}")
 
-            all_results.append(result_entry)
+            summaries.append(summary_entry)
+            # Shallow merge: the full entry shares the raw_counts object
+            # with the job, not a copy of it.
+            all_results.append({**summary_entry, "raw_counts": raw_counts})
 
     # ── 4. Save results ──
     output_dir = os.path.join(os.path.dirname(__file__), '..', 'results')
@@ -166,17 +189,22 @@ def main():
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = os.path.join(output_dir, f"fresnel_can1_{timestamp}.json")
 
-    # Save full results (with raw counts)
-    with open(filename, "w") as f:
-        json.dump(all_results, f, indent=2, default=str)
-    print(f"\n  ✅ Full results saved to: {filename}")
-
-    # Also save a compact summary (without raw counts)
+    # Write the compact summary first — it is tiny and lands on disk
+    # before the heavyweight raw-counts serialization even starts.
     summary_file = os.path.join(output_dir, f"fresnel_can1_summary_{timestamp}.json")
-    summary = [{k: v for k, v in r.items() if k != "raw_counts"} for r in all_results]
     with open(summary_file, "w") as f:
-        json.dump(summary, f, indent=2, default=str)
-    print(f"  📋 Summary saved to:     {summary_file}")
+        json.dump(summaries, f, indent=2, default=str)
+    print(f"\n  📋 Summary saved to:     {summary_file}")
+
+    # Save full results (with raw counts)
+    if orjson is not None:
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(all_results, default=str,
+                                 option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, "w") as f:
+            json.dump(all_results, f, indent=2, default=str)
+    print(f"  ✅ Full results saved to: {filename}")
 
     # ── 5. Print overall summary ──
     total_shots = sum(r.get("total_shots", 0) for r in all_results)
@@ -1,13 +1,17 @@
 import json
 import os
-import glob
 import sys
 
 # Path to results directory
 results_dir = os.path.join(os.path.dirname(__file__), '..', 'results')
 
 def load_all_results():
-    json_files = glob.glob(os.path.join(results_dir, "pasqal_*.json"))
+    # One scandir pass — the entries carry their names, so no fnmatch
+    # pattern compilation or second stat per file like glob does.
+    with os.scandir(results_dir) as it:
+        json_files = [e.path for e in it
+                      if e.name.startswith("pasqal_")
+                      and e.name.endswith(".json")]
     all_data = []
     print(f"Loading {len(json_files)} files...")
     for f in json_files:
@@ -29,35 +33,32 @@ def merge_datasets(raw_data):
     3. Latest in list (if duplicate gamma)
     """
     merged = {}
-    
+    # (is_done, n_shots) per kept entry, so the winner's counts are
+    # summed once when it first appears instead of re-summed on every
+    # later duplicate of the same gamma.
+    priority = {}
+
     for entry in raw_data:
         gamma = entry.get('gamma')
         if gamma is None: continue
-        
+
         # Round gamma to avoid float key mismatch
         g_key = round(gamma, 4)
-        
-        status = entry.get('status', 'UNKNOWN')
+
+        is_done = entry.get('status', 'UNKNOWN') == 'DONE'
         counts = entry.get('counts') or {}
         n_shots = sum(counts.values())
-        
+
         # Determine if this entry is better than existing
-        is_better = True
         if g_key in merged:
-            curr = merged[g_key]
-            curr_status = curr.get('status')
-            curr_shots = sum((curr.get('counts') or {}).values())
-            
-            if curr_status == 'DONE' and status != 'DONE':
-                is_better = False
-            elif curr_status == 'DONE' and status == 'DONE':
-                if curr_shots >= n_shots:
-                    is_better = False
+            curr_done, curr_shots = priority[g_key]
+            if curr_done and (not is_done or curr_shots >= n_shots):
+                continue
             # If both not DONE, new one replaces old (maybe retrying later)
-            
-        if is_better:
-            entry['gamma'] = g_key # Standardize
-            merged[g_key] = entry
+
+        entry['gamma'] = g_key # Standardize
+        merged[g_key] = entry
+        priority[g_key] = (is_done, n_shots)
 
     # Sort
     final = list(merged.values())
@@ -13,8 +13,22 @@ Data sources:
 """
 
 import json
+import mmap
 import os
 import numpy as np
+
+try:
+    # SIMD-accelerated parser — the sweep files are number-heavy nested
+    # counts dicts where stdlib json spends its time tokenizing.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Streaming parser for files too big to materialize at once.
+    import ijson
+except ImportError:
+    ijson = None
 import matplotlib.pyplot as plt
 from matplotlib.ticker import AutoMinorLocator
 
@@ -47,25 +61,82 @@ COLORS = {
 # DATA LOADING
 # ============================================================================
 
-def load_counts_data(filepath):
-    """Load JSON results and extract gamma/counts pairs."""
-    with open(filepath) as f:
-        data = json.load(f)
-    return data
+def _read_bytes(filepath):
+    """Adaptive read: mmap small files (the parser consumes the page
+    cache directly, no copy), one preallocated sequential read for
+    large ones."""
+    size = os.stat(filepath).st_size
+    with open(filepath, 'rb') as f:
+        if 0 < size < 5 * 1024 * 1024:
+            return mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ)
+        buf = bytearray(size)
+        f.readinto(buf)
+        return buf
+
+
+# The only entry fields the figure ever reads; batch ids, error
+# strings and other metadata are dropped as soon as they are parsed.
+ENTRY_KEYS = {'status', 'gamma', 'counts', 'core_counts', 'device'}
 
 
-def compute_stats(counts, n_qubits=9):
+def load_counts_data(filepath, keep_keys=ENTRY_KEYS):
+    """Load JSON results and extract gamma/counts pairs."""
+    # Files past the mmap threshold are stream-parsed entry by entry
+    # when ijson is available: peak memory stays near one entry instead
+    # of the whole sweep, since the projection drops the rest anyway.
+    if ijson is not None and os.stat(filepath).st_size >= 5 * 1024 * 1024:
+        with open(filepath, 'rb') as f:
+            if keep_keys is None:
+                return list(ijson.items(f, 'item'))
+            return [{k: v for k, v in e.items() if k in keep_keys}
+                    for e in ijson.items(f, 'item')]
+
+    # Parsing straight from the byte buffer skips the text-mode UTF-8
+    # decode of the whole file.
+    data = _read_bytes(filepath)
+    if isinstance(data, mmap.mmap):
+        # orjson accepts a buffer view; stdlib json needs real bytes.
+        data = memoryview(data) if orjson is not None else data[:]
+    if orjson is not None:
+        entries = orjson.loads(data)
+        if keep_keys is not None:
+            # orjson has no object_hook, so project the entry records
+            # after parse — the metadata values are freed immediately.
+            entries = [{k: v for k, v in e.items() if k in keep_keys}
+                       for e in entries]
+        return entries
+    if keep_keys is None:
+        return json.loads(data)
+    # Entry records always carry 'status'; counts dicts never do, so
+    # the hook passes the inner dicts through untouched.
+    return json.loads(data, object_hook=lambda d:
+                      {k: v for k, v in d.items() if k in keep_keys}
+                      if 'status' in d else d)
+
+
+# Core register size and its ground-state key, built once instead of
+# re-multiplying the string on every call.
+N_QUBITS = 9
+GROUND = '0' * N_QUBITS
+
+
+def compute_stats(counts, n_qubits=N_QUBITS, ground=GROUND):
     """Compute physics observables from bitstring counts."""
-    total = sum(counts.values())
+    vals = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    total = int(vals.sum())
     if total == 0:
         return {'p0': 0, 'rho': 0, 'n_states': 0}
 
-    ground = counts.get('0' * n_qubits, 0)
+    ground = counts.get(ground, 0)
     p0 = ground / total
 
-    rho = sum(
-        bs.count('1') / n_qubits * n for bs, n in counts.items()
-    ) / total
+    # Pack each key into an integer once; the density is then a single
+    # vectorized popcount + dot product (one POPCNT per key) instead of
+    # a per-bitstring count('1') scan, and stays cheap as n_qubits
+    # grows toward full-register widths.
+    packed = np.fromiter((int(bs, 2) for bs in counts), dtype=np.uint64,
+                         count=len(counts))
+    rho = float(np.bitwise_count(packed).dot(vals)) / (n_qubits * total)
 
     return {
         'p0': p0,
@@ -75,6 +146,39 @@ def compute_stats(counts, n_qubits=9):
     }
 
 
+# Per-device stats live in one structured array (SoA): a single pass
+# over each results file, and every plot call below reads a contiguous
+# column (arr['gamma']) instead of four parallel Python lists.
+STATS_DTYPE = np.dtype([('gamma', 'f8'), ('rho', 'f8'),
+                        ('p0', 'f8'), ('n_states', 'i4')])
+
+
+def load_device(data, key='counts', device=None):
+    """Collect (γ, ⟨n⟩, P₀, #states) records for one device, γ-sorted."""
+    # len(data) bounds the row count, so write into a preallocated
+    # record array and trim — no growing list and no list→array copy.
+    arr = np.empty(len(data), dtype=STATS_DTYPE)
+    j = 0
+    for entry in data:
+        if entry.get('status') != 'DONE':
+            continue
+        if device is not None and entry.get('device') != device:
+            continue
+        # One lookup covers both the key-present and the non-empty
+        # check; a DONE entry with an empty counts dict carries no
+        # statistics, so it is skipped rather than plotted as zeros.
+        counts = entry.get(key)
+        if not counts:
+            continue
+        stats = compute_stats(counts)
+        arr[j] = (entry['gamma'], stats['rho'],
+                  stats['p0'], stats['n_states'])
+        j += 1
+    arr = arr[:j]
+    arr.sort(order='gamma')
+    return arr
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
@@ -85,121 +189,71 @@ os.makedirs(figures_dir, exist_ok=True)
 
 # --- Load EMU_FREE fine sweep ---
 fine_data = load_counts_data(os.path.join(results_dir, 'pasqal_fine_sweep_20260216_190558.json'))
-emu_free_gamma = []
-emu_free_rho = []
-emu_free_p0 = []
-emu_free_states = []
-
-for entry in fine_data:
-    if entry.get('status') == 'DONE' and 'counts' in entry:
-        gamma = entry['gamma']
-        stats = compute_stats(entry['counts'])
-        emu_free_gamma.append(gamma)
-        emu_free_rho.append(stats['rho'])
-        emu_free_p0.append(stats['p0'])
-        emu_free_states.append(stats['n_states'])
-
-# Sort by gamma
-idx = np.argsort(emu_free_gamma)
-emu_free_gamma = np.array(emu_free_gamma)[idx]
-emu_free_rho = np.array(emu_free_rho)[idx]
-emu_free_p0 = np.array(emu_free_p0)[idx]
-emu_free_states = np.array(emu_free_states)[idx]
+emu_free = load_device(fine_data)
 
 # --- Load EMU_FREE + EMU_SV from comparison file ---
 comp_data = load_counts_data(os.path.join(results_dir, 'emulator_comparison_20260216_220852.json'))
-emu_sv_gamma = []
-emu_sv_rho = []
-emu_sv_p0 = []
-emu_sv_states = []
-
-# Also grab EMU_FREE points from comparison (coarse sweep)
-comp_free_gamma = []
-comp_free_rho = []
-comp_free_p0 = []
-
-for entry in comp_data:
-    if entry.get('status') == 'DONE' and 'counts' in entry:
-        stats = compute_stats(entry['counts'])
-        if entry.get('device') == 'EMU_SV':
-            emu_sv_gamma.append(entry['gamma'])
-            emu_sv_rho.append(stats['rho'])
-            emu_sv_p0.append(stats['p0'])
-            emu_sv_states.append(stats['n_states'])
-        elif entry.get('device') == 'EMU_FREE':
-            comp_free_gamma.append(entry['gamma'])
-            comp_free_rho.append(stats['rho'])
-            comp_free_p0.append(stats['p0'])
-
-# Merge EMU_FREE: coarse + fine (deduplicate by gamma)
-all_free_gamma = list(emu_free_gamma) + comp_free_gamma
-all_free_rho = list(emu_free_rho) + comp_free_rho
-all_free_p0 = list(emu_free_p0) + comp_free_p0
-
-# Deduplicate (keep fine sweep value if duplicate)
-merged = {}
-for g, r, p in zip(all_free_gamma, all_free_rho, all_free_p0):
-    if g not in merged:
-        merged[g] = (r, p)
-all_free_gamma = sorted(merged.keys())
-all_free_rho = [merged[g][0] for g in all_free_gamma]
-all_free_p0 = [merged[g][1] for g in all_free_gamma]
+emu_sv = load_device(comp_data, device='EMU_SV')
+comp_free = load_device(comp_data, device='EMU_FREE')
+
+# Merge EMU_FREE: fine + coarse, deduplicated by gamma. np.unique keeps
+# the first occurrence per γ, so fine-sweep rows win over coarse ones;
+# rounding the key to 6 decimals tolerates float drift between files
+# instead of trusting exact float equality.
+all_free = np.concatenate([emu_free, comp_free])
+_, first = np.unique(np.round(all_free['gamma'], 6), return_index=True)
+all_free = all_free[first]
+
+# --- Locate newest EMU_FRESNEL / FRESNEL_CAN1 files ---
+# One scandir pass serves both prefixes: the timestamped names sort
+# lexicographically, so a running max per prefix replaces two full
+# directory listings each followed by an O(n log n) sort.
+latest_fresnel = latest_qpu = None
+with os.scandir(results_dir) as it:
+    for e in it:
+        if e.name.startswith('emu_fresnel'):
+            if latest_fresnel is None or e.name > latest_fresnel:
+                latest_fresnel = e.name
+        elif e.name.startswith('fresnel_validation'):
+            if latest_qpu is None or e.name > latest_qpu:
+                latest_qpu = e.name
 
 # --- Load EMU_FRESNEL ---
-fresnel_files = sorted([f for f in os.listdir(results_dir) if f.startswith('emu_fresnel')])
-if fresnel_files:
-    fresnel_data = load_counts_data(os.path.join(results_dir, fresnel_files[-1]))
+if latest_fresnel:
+    fresnel_data = load_counts_data(os.path.join(results_dir, latest_fresnel))
 else:
     fresnel_data = []
-
-emu_fresnel_gamma = []
-emu_fresnel_rho = []
-emu_fresnel_p0 = []
-emu_fresnel_states = []
-
-for entry in fresnel_data:
-    if entry.get('status') == 'DONE' and 'core_counts' in entry:
-        stats = compute_stats(entry['core_counts'])
-        emu_fresnel_gamma.append(entry['gamma'])
-        emu_fresnel_rho.append(stats['rho'])
-        emu_fresnel_p0.append(stats['p0'])
-        emu_fresnel_states.append(stats['n_states'])
+emu_fresnel = load_device(fresnel_data, key='core_counts')
 
 # --- Load FRESNEL_CAN1 QPU (if exists) ---
-qpu_files = sorted([f for f in os.listdir(results_dir) if f.startswith('fresnel_validation')])
-fresnel_qpu_gamma = []
-fresnel_qpu_rho = []
-fresnel_qpu_p0 = []
-
-if qpu_files:
-    qpu_data = load_counts_data(os.path.join(results_dir, qpu_files[-1]))
-    for entry in qpu_data:
-        if entry.get('status') == 'DONE' and 'core_counts' in entry:
-            stats = compute_stats(entry['core_counts'])
-            fresnel_qpu_gamma.append(entry['gamma'])
-            fresnel_qpu_rho.append(stats['rho'])
-            fresnel_qpu_p0.append(stats['p0'])
+if latest_qpu:
+    qpu_data = load_counts_data(os.path.join(results_dir, latest_qpu))
+else:
+    qpu_data = []
+fresnel_qpu = load_device(qpu_data, key='core_counts')
 
 
 # ============================================================================
 # FIGURE
 # ============================================================================
 
-fig, axes = plt.subplots(1, 3, figsize=(14, 4.5))
+# sharex: the three panels cover the same gamma range, so the view
+# limits and transform machinery are set up once and inherited.
+fig, axes = plt.subplots(1, 3, figsize=(14, 4.5), sharex=True)
 fig.suptitle('Emulator Cross-Platform Comparison — Neutral-Atom Dephasing Response', fontsize=14, fontweight='bold', y=1.02)
 
 # --- Panel A: Mean Rydberg Density ---
 ax = axes[0]
-ax.plot(all_free_gamma, all_free_rho, '-o', color=COLORS['EMU_FREE'],
+ax.plot(all_free['gamma'], all_free['rho'], '-o', color=COLORS['EMU_FREE'],
         markersize=4, linewidth=1.5, label='EMU_FREE (9q)', zorder=3)
-if emu_sv_gamma:
-    ax.scatter(emu_sv_gamma, emu_sv_rho, marker='s', s=50, color=COLORS['EMU_SV'],
-               edgecolors='k', linewidths=0.5, label='EMU_SV (9q)', zorder=4)
-ax.scatter(emu_fresnel_gamma, emu_fresnel_rho, marker='D', s=70, color=COLORS['EMU_FRESNEL'],
-           edgecolors='k', linewidths=0.8, label='EMU_FRESNEL (9/42q)', zorder=5)
-if fresnel_qpu_gamma:
-    ax.scatter(fresnel_qpu_gamma, fresnel_qpu_rho, marker='*', s=120, color=COLORS['FRESNEL_CAN1'],
-               edgecolors='k', linewidths=0.8, label='FRESNEL_CAN1 QPU (9/42q)', zorder=6)
+if emu_sv.size:
+    ax.scatter(emu_sv['gamma'], emu_sv['rho'], marker='s', s=50, color=COLORS['EMU_SV'],
+               edgecolors='k', linewidths=0.5, label='EMU_SV (9q)', zorder=4, rasterized=True)
+ax.scatter(emu_fresnel['gamma'], emu_fresnel['rho'], marker='D', s=70, color=COLORS['EMU_FRESNEL'],
+           edgecolors='k', linewidths=0.8, label='EMU_FRESNEL (9/42q)', zorder=5, rasterized=True)
+if fresnel_qpu.size:
+    ax.scatter(fresnel_qpu['gamma'], fresnel_qpu['rho'], marker='*', s=120, color=COLORS['FRESNEL_CAN1'],
+               edgecolors='k', linewidths=0.8, label='FRESNEL_CAN1 QPU (9/42q)', zorder=6, rasterized=True)
 
 ax.set_xlabel(r'Dephasing Strength $\gamma$')
 ax.set_ylabel(r'$\langle n \rangle$ (Mean Rydberg density)')
@@ -213,23 +267,22 @@ ax.yaxis.set_minor_locator(AutoMinorLocator())
 
 # --- Panel B: Ground-State Probability ---
 ax = axes[1]
-ax.plot(all_free_gamma, all_free_p0, '-o', color=COLORS['EMU_FREE'],
+ax.plot(all_free['gamma'], all_free['p0'], '-o', color=COLORS['EMU_FREE'],
         markersize=4, linewidth=1.5, label='EMU_FREE', zorder=3)
-if emu_sv_p0:
-    ax.scatter(emu_sv_gamma, emu_sv_p0, marker='s', s=50, color=COLORS['EMU_SV'],
-               edgecolors='k', linewidths=0.5, label='EMU_SV', zorder=4)
-ax.scatter(emu_fresnel_gamma, emu_fresnel_p0, marker='D', s=70, color=COLORS['EMU_FRESNEL'],
-           edgecolors='k', linewidths=0.8, label='EMU_FRESNEL', zorder=5)
-if fresnel_qpu_p0:
-    ax.scatter(fresnel_qpu_gamma, fresnel_qpu_p0, marker='*', s=120, color=COLORS['FRESNEL_CAN1'],
-               edgecolors='k', linewidths=0.8, label='FRESNEL_CAN1 QPU', zorder=6)
+if emu_sv.size:
+    ax.scatter(emu_sv['gamma'], emu_sv['p0'], marker='s', s=50, color=COLORS['EMU_SV'],
+               edgecolors='k', linewidths=0.5, label='EMU_SV', zorder=4, rasterized=True)
+ax.scatter(emu_fresnel['gamma'], emu_fresnel['p0'], marker='D', s=70, color=COLORS['EMU_FRESNEL'],
+           edgecolors='k', linewidths=0.8, label='EMU_FRESNEL', zorder=5, rasterized=True)
+if fresnel_qpu.size:
+    ax.scatter(fresnel_qpu['gamma'], fresnel_qpu['p0'], marker='*', s=120, color=COLORS['FRESNEL_CAN1'],
+               edgecolors='k', linewidths=0.8, label='FRESNEL_CAN1 QPU', zorder=6, rasterized=True)
 
 ax.set_xlabel(r'Dephasing Strength $\gamma$')
 ax.set_ylabel(r'$P_0$ (Ground-state probability)')
 ax.set_title('(B) Fidelity Collapse')
 ax.axvline(x=0.535, color='gray', linestyle='--', alpha=0.4)
 ax.legend(loc='lower right', framealpha=0.9)
-ax.set_xlim(-0.02, 0.65)
 ax.set_ylim(-0.02, 1.05)
 ax.xaxis.set_minor_locator(AutoMinorLocator())
 ax.yaxis.set_minor_locator(AutoMinorLocator())
@@ -238,37 +291,48 @@ ax.yaxis.set_minor_locator(AutoMinorLocator())
 ax = axes[2]
 
 # Interpolate EMU_FREE baseline for comparison
-from scipy.interpolate import interp1d
-
-if len(all_free_gamma) >= 2:
-    interp_rho = interp1d(all_free_gamma, all_free_rho, kind='linear', fill_value='extrapolate')
-    interp_p0 = interp1d(all_free_gamma, all_free_p0, kind='linear', fill_value='extrapolate')
+# np.interp is the same piecewise-linear lookup in pure C — no scipy
+# import just for this. Outside the sweep range it clamps to the edge
+# value, but every emulator/QPU gamma lies inside the EMU_FREE sweep.
+if len(all_free) >= 2:
+    def interp_rho(g):
+        return np.interp(g, all_free['gamma'], all_free['rho'])
+
+    def interp_p0(g):
+        return np.interp(g, all_free['gamma'], all_free['p0'])
+
+    # One ax.bar call per device: the Δ⟨n⟩ and ΔP₀ bars go in together
+    # (single patch batch), then the ΔP₀ half gets its alpha/hatch and
+    # each half's lead patch carries the legend label.
+    def delta_bars(arr, color, labels):
+        n = len(arr)
+        xs = np.concatenate([arr['gamma'] - 0.012, arr['gamma'] + 0.012])
+        heights = np.concatenate([arr['rho'] - interp_rho(arr['gamma']),
+                                  arr['p0'] - interp_p0(arr['gamma'])])
+        bars = ax.bar(xs, heights, width=0.02, color=color, rasterized=True)
+        for rect in bars[:n]:
+            rect.set_alpha(0.7)
+        for rect in bars[n:]:
+            rect.set_alpha(0.35)
+            rect.set_hatch('///')
+        bars[0].set_label(labels[0])
+        bars[n].set_label(labels[1])
 
     # EMU_FRESNEL deltas
-    if emu_fresnel_gamma:
-        delta_rho = [emu_fresnel_rho[i] - interp_rho(g) for i, g in enumerate(emu_fresnel_gamma)]
-        delta_p0 = [emu_fresnel_p0[i] - interp_p0(g) for i, g in enumerate(emu_fresnel_gamma)]
-
-        ax.bar(np.array(emu_fresnel_gamma) - 0.012, delta_rho, width=0.02,
-               color=COLORS['EMU_FRESNEL'], alpha=0.7, label=r'$\Delta\langle n \rangle$')
-        ax.bar(np.array(emu_fresnel_gamma) + 0.012, delta_p0, width=0.02,
-               color=COLORS['EMU_FRESNEL'], alpha=0.35, hatch='///', label=r'$\Delta P_0$')
+    if emu_fresnel.size:
+        delta_bars(emu_fresnel, COLORS['EMU_FRESNEL'],
+                   (r'$\Delta\langle n \rangle$', r'$\Delta P_0$'))
 
     # FRESNEL_CAN1 QPU deltas (if available)
-    if fresnel_qpu_gamma:
-        delta_rho_qpu = [fresnel_qpu_rho[i] - interp_rho(g) for i, g in enumerate(fresnel_qpu_gamma)]
-        delta_p0_qpu = [fresnel_qpu_p0[i] - interp_p0(g) for i, g in enumerate(fresnel_qpu_gamma)]
-        ax.bar(np.array(fresnel_qpu_gamma) - 0.012, delta_rho_qpu, width=0.02,
-               color=COLORS['FRESNEL_CAN1'], alpha=0.7, label=r'QPU $\Delta\langle n \rangle$')
-        ax.bar(np.array(fresnel_qpu_gamma) + 0.012, delta_p0_qpu, width=0.02,
-               color=COLORS['FRESNEL_CAN1'], alpha=0.35, hatch='///', label=r'QPU $\Delta P_0$')
+    if fresnel_qpu.size:
+        delta_bars(fresnel_qpu, COLORS['FRESNEL_CAN1'],
+                   (r'QPU $\Delta\langle n \rangle$', r'QPU $\Delta P_0$'))
 
 ax.axhline(y=0, color='k', linewidth=0.5)
 ax.set_xlabel(r'Dephasing Strength $\gamma$')
 ax.set_ylabel(r'$\Delta$ from EMU_FREE baseline')
 ax.set_title('(C) Hardware Noise Effect')
 ax.legend(loc='best', framealpha=0.9)
-ax.set_xlim(-0.02, 0.65)
 ax.xaxis.set_minor_locator(AutoMinorLocator())
 ax.yaxis.set_minor_locator(AutoMinorLocator())
 
@@ -289,12 +353,17 @@ print(f"  {'γ':<6} | {'EMU_FREE ⟨n⟩':<13} | {'EMU_FRESNEL ⟨n⟩':<15} | {
       f"{'EMU_FREE P₀':<12} | {'EMU_FRESNEL P₀':<14}")
 print("-" * 75)
 
-for i, g in enumerate(emu_fresnel_gamma):
-    ref_rho = float(interp_rho(g))
-    ref_p0 = float(interp_p0(g))
-    dr = emu_fresnel_rho[i] - ref_rho
-    dp = emu_fresnel_p0[i] - ref_p0
-    print(f"  {g:<6.3f} | {ref_rho:<13.4f} | {emu_fresnel_rho[i]:<15.4f} | {dr:<+9.4f} | "
-          f"{ref_p0:<12.1%} | {emu_fresnel_p0[i]:<14.1%}")
+# One vectorized baseline lookup for the whole table, one stdout
+# flush for all rows.
+ref_rho_tbl = interp_rho(emu_fresnel['gamma'])
+ref_p0_tbl = interp_p0(emu_fresnel['gamma'])
+
+rows = [
+    f"  {rec['gamma']:<6.3f} | {ref_rho:<13.4f} | {rec['rho']:<15.4f} | "
+    f"{rec['rho'] - ref_rho:<+9.4f} | {ref_p0:<12.1%} | {rec['p0']:<14.1%}"
+    for rec, ref_rho, ref_p0 in zip(emu_fresnel, ref_rho_tbl, ref_p0_tbl)
+]
+if rows:
+    print('\n'.join(rows))
 
 plt.close()
@@ -15,15 +15,28 @@ import os
 import sys
 import time
 import json
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+try:
+    # SIMD-accelerated serializer for the counts-heavy results dump.
+    import orjson
+except ImportError:
+    orjson = None
+
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code'))
 
 from pasqal_cloud import SDK
 from wormhole_pulser_continuous import build_wormhole_sequence
 
 WAVE_SIZE = 8       # Max concurrent batches (Explorer limit = 10)
-POLL_INTERVAL = 3   # Seconds between status checks
+POLL_INTERVAL = 3   # Initial seconds between status checks
+POLL_CAP = 20       # Backoff ceiling for long queue waits
+
+# 9-qubit ground-state key, built once instead of per summary row
+GROUND9 = "0" * 9
 
 
 def get_client() -> SDK:
@@ -63,9 +76,41 @@ def submit_wave(sdk, gamma_slice, runs, device_type):
     return wave_batches
 
 
+def _poll_batch(sdk, batch_id):
+    """Poll one batch until it leaves PENDING/RUNNING.
+
+    The sleep backs off exponentially (capped at POLL_CAP) and resets
+    whenever the status changes: short jobs stay responsive, long queue
+    waits stop hammering the API with a request every few seconds.
+    """
+    delay = POLL_INTERVAL
+    last_status = None
+    while True:
+        batch = sdk.get_batch(batch_id)
+        if batch.status not in ("PENDING", "RUNNING"):
+            return batch
+        if batch.status != last_status:
+            last_status = batch.status
+            delay = POLL_INTERVAL
+        time.sleep(delay)
+        delay = min(POLL_CAP, delay * 1.5)
+
+
 def wait_for_wave(sdk, wave_batches):
-    """Poll all batches in a wave until they complete. Returns results."""
+    """Poll all batches in a wave until they complete. Returns results.
+
+    The batches are polled concurrently (the SDK's HTTP calls release
+    the GIL), so the wave finishes on its slowest batch instead of the
+    sum of every batch's queue time.
+    """
     results = []
+    to_poll = [item for item in wave_batches if item["batch_id"] is not None]
+    with ThreadPoolExecutor(max_workers=max(1, len(to_poll))) as pool:
+        done = dict(zip(
+            (item["batch_id"] for item in to_poll),
+            pool.map(lambda item: _poll_batch(sdk, item["batch_id"]), to_poll),
+        ))
+
     for item in wave_batches:
         if item["batch_id"] is None:
             results.append(item)
@@ -73,16 +118,8 @@ def wait_for_wave(sdk, wave_batches):
 
         gamma    = item["gamma"]
         batch_id = item["batch_id"]
-        print(f"  Polling γ={gamma:.3f}...", end="", flush=True)
-
-        while True:
-            batch = sdk.get_batch(batch_id)
-            if batch.status not in ("PENDING", "RUNNING"):
-                break
-            print(".", end="", flush=True)
-            time.sleep(POLL_INTERVAL)
-
-        print(f" → {batch.status}")
+        batch    = done[batch_id]
+        print(f"  γ={gamma:.3f} → {batch.status}")
 
         if batch.status == "DONE":
             for job in batch.ordered_jobs:
@@ -139,8 +176,13 @@ if __name__ == "__main__":
     os.makedirs(output_dir, exist_ok=True)
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = os.path.join(output_dir, f"pasqal_fine_sweep_{timestamp}.json")
-    with open(filename, "w") as f:
-        json.dump(all_results, f, indent=2, default=str)
+    if orjson is not None:
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(all_results, default=str,
+                                 option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, "w") as f:
+            json.dump(all_results, f, indent=2, default=str)
 
     print(f"\nResults saved to: {filename}")
 
@@ -151,5 +193,6 @@ if __name__ == "__main__":
         status = r.get("status", "?")
         counts = r.get("counts")
         n = len(counts) if counts else 0
-        gp = counts.get("0" * 9, 0) / sum(counts.values()) * 100 if counts and sum(counts.values()) > 0 else 0
+        n_shots = sum(counts.values()) if counts else 0
+        gp = counts.get(GROUND9, 0) / n_shots * 100 if n_shots > 0 else 0
         print(f"  γ={gamma:.3f}  status={status}  states={n}  P₀={gp:.0f}%")
@@ -17,25 +17,94 @@ Usage
     python run_wormhole_pasqal.py
 """
 
+import asyncio
+import hashlib
 import os
+import random
 import sys
 import time
 import json
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 # Add code directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'code'))
 
 from pasqal_cloud import SDK
 from pasqal_cloud.device import EmulatorType, DeviceTypeName
-from wormhole_pulser_continuous import build_wormhole_sequence
+from wormhole_pulser_continuous import serialize_parametric_sequence
+from batch_cache import lookup_or_submit
 
 
 # ============================================================================
 # 1. AUTHENTICATION
 # ============================================================================
 
+# Auth token persisted across script runs: a fresh OAuth handshake per
+# invocation adds seconds of latency before the first batch goes up,
+# and tokens stay valid far longer than a typical debug cycle.
+TOKEN_CACHE = os.path.expanduser("~/.cache/pasqal_token.json")
+
+
+class _StoredTokenProvider:
+    """Minimal token_provider serving a token restored from disk."""
+
+    def __init__(self, token: str):
+        self._token = token
+
+    def get_token(self) -> str:
+        return self._token
+
+
+def _cached_token() -> str | None:
+    """Stored bearer token, or None if missing or within 60s of expiry."""
+    try:
+        with open(TOKEN_CACHE) as f:
+            stored = json.load(f)
+        if stored["expiry"] - time.time() > 60:
+            return stored["token"]
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+def _store_token(sdk: SDK):
+    """Best-effort: persist this session's token for the next run."""
+    try:
+        token = sdk._client.authenticator.token_provider.get_token()
+        os.makedirs(os.path.dirname(TOKEN_CACHE), exist_ok=True)
+        with open(TOKEN_CACHE, "w") as f:
+            json.dump({"token": token, "expiry": time.time() + 50 * 60}, f)
+    except Exception:
+        pass  # client internals differ across SDK versions; skip caching
+
+
+def _pool_connections(sdk: SDK):
+    """Mount a keep-alive connection pool on the SDK's HTTP client.
+
+    The async pollers and the result-download threads otherwise open a
+    TLS connection per call; a pooled requests.Session lets them share
+    already-handshaked connections.
+    """
+    try:
+        import requests
+        from requests.adapters import HTTPAdapter
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=8,
+                                              pool_maxsize=16))
+        sdk._client.session = session
+    except Exception:
+        pass  # the SDK may manage its own transport; plain calls still work
+
+
 def get_client() -> SDK:
-    """Create an authenticated Pasqal Cloud SDK client."""
+    """Create an authenticated Pasqal Cloud SDK client.
+
+    Reuses a disk-cached auth token when one is still fresh, so reruns
+    skip the OAuth handshake; falls back to the username/password flow
+    (and stores the resulting token) otherwise.
+    """
 
     project_id = os.environ.get("PASQAL_PROJECT_ID")
     username   = os.environ.get("PASQAL_USERNAME")
@@ -45,6 +114,21 @@ def get_client() -> SDK:
         print("ERROR: PASQAL_PROJECT_ID not set.")
         print("  export PASQAL_PROJECT_ID='your-project-id'")
         sys.exit(1)
+
+    token = _cached_token()
+    if token is not None:
+        print(f"Reusing cached token (project: {project_id[:8]}...)...")
+        try:
+            sdk = SDK(
+                project_id=project_id,
+                token_provider=_StoredTokenProvider(token),
+            )
+            _pool_connections(sdk)
+            print("Authenticated from token cache.\n")
+            return sdk
+        except Exception:
+            print("Cached token rejected; re-authenticating.")
+
     if not username or not password:
         print("ERROR: PASQAL_USERNAME and PASQAL_PASSWORD not set.")
         print("  export PASQAL_USERNAME='your-email@example.com'")
@@ -57,6 +141,8 @@ def get_client() -> SDK:
         username=username,
         password=password,
     )
+    _store_token(sdk)
+    _pool_connections(sdk)
     print("Authenticated successfully.\n")
     return sdk
 
@@ -65,6 +151,33 @@ def get_client() -> SDK:
 # 2. BATCH SUBMISSION
 # ============================================================================
 
+# Disk cache for the serialized parametric sequence: reruns of the
+# script (common while debugging or resubmitting failed batches) skip
+# the sequence build + to_abstract_repr cost entirely.
+CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', 'cache')
+
+
+@lru_cache(maxsize=8)
+def _serialized_sequence(coupling_time: int = 500) -> str:
+    """Serialized parametric wormhole sequence (γ left as a variable).
+
+    Two-level cache: lru_cache for in-process reuse, write-through JSON
+    files under pasqal_native/cache/ across runs. The abstract repr is
+    pure JSON text, so caching the string is exact.
+    """
+    key = hashlib.sha256(f"parametric:{coupling_time}".encode()).hexdigest()
+    path = os.path.join(CACHE_DIR, f"seq_{key[:16]}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return f.read()
+
+    serialized = serialize_parametric_sequence(coupling_time=coupling_time)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(serialized)
+    return serialized
+
+
 def submit_gamma_sweep(
     sdk: SDK,
     gamma_values: list[float] | None = None,
@@ -72,7 +185,11 @@ def submit_gamma_sweep(
     device_type: str = "EMU_FREE",
 ):
     """
-    Submit one batch per gamma value to a Pasqal emulator.
+    Submit the whole sweep as ONE batch with one job per gamma.
+
+    γ is a declared Pulser variable in the serialized sequence, so a
+    single REST submission (and a single queue entry) carries every
+    sweep point; each job binds its own γ through job variables.
 
     Parameters
     ----------
@@ -96,103 +213,198 @@ def submit_gamma_sweep(
     if gamma_values is None:
         gamma_values = [0.0, 0.1, 0.2, 0.3, 0.4, 0.535, 0.7, 0.8, 1.0]
 
-    batches = []
-
-    for gamma in gamma_values:
-        print(f"γ = {gamma:.3f}  →  building sequence...", end="  ")
-        seq = build_wormhole_sequence(gamma=gamma, coupling_time=500)
-        serialized = seq.to_abstract_repr()
-
-        print(f"submitting to {device_type}...", end="  ")
-        try:
-            batch = sdk.create_batch(
-                serialized_sequence=serialized,
-                jobs=[{"runs": runs}],
-                device_type=device_type,
-            )
-            print(f"batch {batch.id}")
-            batches.append({
-                "gamma": gamma,
-                "batch_id": batch.id,
-                "status": batch.status,
-            })
-        except Exception as e:
-            print(f"FAILED: {e}")
-            batches.append({
-                "gamma": gamma,
-                "batch_id": None,
-                "status": "SUBMIT_ERROR",
-                "error": str(e),
-            })
-
-    return batches
+    print("Building parametric sequence...")
+    serialized = _serialized_sequence(coupling_time=500)
+    jobs = [{"runs": runs, "variables": {"gamma": g}} for g in gamma_values]
+
+    print(f"\nSubmitting 1 batch ({len(jobs)} jobs) to {device_type}...")
+    try:
+        # lookup_or_submit short-circuits to the existing batch if this
+        # exact (sequence, jobs, device) was submitted before.
+        batch = lookup_or_submit(sdk, serialized, runs, device_type,
+                                 jobs=jobs)
+    except Exception as e:
+        print(f"  FAILED: {e}")
+        return [{
+            "gamma": gamma,
+            "batch_id": None,
+            "status": "SUBMIT_ERROR",
+            "error": str(e),
+        } for gamma in gamma_values]
+
+    print(f"  batch {batch.id}")
+    # One metadata entry per gamma, all sharing the batch; job_index
+    # maps each gamma to its slot in batch.ordered_jobs. The stashed
+    # response object lets collect_results skip polling a batch that is
+    # already terminal (e.g. a cache hit on a finished batch).
+    return [{
+        "gamma": gamma,
+        "batch_id": batch.id,
+        "job_index": i,
+        "status": batch.status,
+        "_batch": batch,
+    } for i, gamma in enumerate(gamma_values)]
 
 
 # ============================================================================
 # 3. RESULT COLLECTION
 # ============================================================================
 
-def collect_results(sdk: SDK, batches: list[dict], poll_interval: int = 5):
+# Backoff schedule for batch polling: doubling from POLL_BASE up to
+# POLL_CAP cuts the API calls over a multi-minute queue wait by ~5-10x;
+# the ±20% jitter keeps a wave of batches from polling in lockstep.
+POLL_BASE = 1.0
+POLL_CAP = 30.0
+
+
+async def _poll_one(sdk: SDK, batch_id: str):
+    """Poll one batch until it leaves PENDING/RUNNING.
+
+    The blocking SDK call runs in a worker thread via asyncio.to_thread,
+    so the event loop keeps every other batch's poll in flight while
+    this one sleeps. The sleep backs off exponentially and resets when
+    the status changes (e.g. PENDING → RUNNING), so a batch that just
+    started executing is polled quickly again.
+    """
+    attempt = 0
+    last_status = None
+    while True:
+        batch = await asyncio.to_thread(sdk.get_batch, batch_id)
+        if batch.status not in ("PENDING", "RUNNING"):
+            return batch
+        if batch.status != last_status:
+            last_status = batch.status
+            attempt = 0
+        delay = min(POLL_CAP, POLL_BASE * 2 ** attempt)
+        await asyncio.sleep(delay * random.uniform(0.8, 1.2))
+        attempt += 1
+
+
+async def _collect_async(sdk: SDK, batches: list[dict]):
+    """Worker-pool polling: the sweep finishes with its slowest batch
+    instead of the sum of every batch's queue time."""
+    queue: asyncio.Queue = asyncio.Queue()
+    done: dict[str, object] = {}
+    queued: set[str] = set()
+    for item in batches:
+        if item["batch_id"] is None:
+            continue
+        if item["batch_id"] in done or item["batch_id"] in queued:
+            continue  # many gammas can share one batch — poll it once
+        # Check-after-submit fast path: if the submission response was
+        # already terminal, reuse it — no poll round trip at all.
+        ready = item.get("_batch")
+        if ready is not None and ready.status not in ("PENDING", "RUNNING"):
+            done[item["batch_id"]] = ready
+            continue
+        queue.put_nowait(item)
+        queued.add(item["batch_id"])
+
+    async def worker():
+        while not queue.empty():
+            item = queue.get_nowait()
+            done[item["batch_id"]] = await _poll_one(sdk, item["batch_id"])
+
+    n_workers = min(8, max(1, queue.qsize()))
+    await asyncio.gather(*(worker() for _ in range(n_workers)))
+    return done
+
+
+def _fetch_one(sdk: SDK, job):
+    """Counts for one job: the batch response if it carries them,
+    otherwise a REST fetch of the job's results."""
+    if job.status == "DONE" and getattr(job, 'result', None):
+        return {"status": "DONE", "counts": job.result}
+    try:
+        job_result = sdk._client.get_job_results(job.id)
+        counts = job_result.counter if job_result else None
+        return {"status": job.status, "counts": counts}
+    except Exception as e:
+        return {"status": job.status, "error": str(e)}
+
+
+def collect_results(sdk: SDK, batches: list[dict],
+                    progress_file: str | None = None):
     """
     Poll each batch until completion and collect measurement counts.
+
+    Polling runs concurrently on an asyncio worker pool, and once a
+    batch is terminal its job results download in parallel on a thread
+    pool; results are reported below in submission order, so the call
+    site is unchanged.
+
+    Every entry is also appended to a JSON Lines progress file and
+    fsync'd the moment it is built, so a crash while collecting loses
+    at most the line being written; save_results still writes the
+    usual full .json afterwards.
     """
+    if progress_file is None:
+        output_dir = os.path.join(os.path.dirname(__file__), '..', 'results')
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        progress_file = os.path.join(
+            output_dir, f"pasqal_emu_tn_{timestamp}.progress.jsonl")
+
+    done = asyncio.run(_collect_async(sdk, batches))
+
+    # Download every finished job's counts up front: the per-job REST
+    # fetches dominate collection time once polling ends, and they are
+    # independent, so eight at a time costs ~one round trip per eight.
+    to_fetch = []
+    for item in batches:
+        if item["batch_id"] is None:
+            continue
+        batch = done[item["batch_id"]]
+        if batch.status != "DONE":
+            continue
+        jobs = batch.ordered_jobs
+        if "job_index" in item:
+            jobs = [jobs[item["job_index"]]]
+        to_fetch.extend(j for j in jobs if j.id not in {f.id for f in to_fetch})
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(to_fetch)))) as pool:
+        fetched = dict(zip((j.id for j in to_fetch),
+                           pool.map(lambda j: _fetch_one(sdk, j), to_fetch)))
+
     results = []
+    pf = open(progress_file, "w")
+
+    def keep(entry):
+        results.append(entry)
+        pf.write(json.dumps(entry, default=str) + "\n")
+        pf.flush()
+        os.fsync(pf.fileno())
 
     for item in batches:
         if item["batch_id"] is None:
-            results.append(item)
+            keep(item)
             continue
 
         gamma    = item["gamma"]
         batch_id = item["batch_id"]
-        print(f"\nPolling γ={gamma:.3f} (batch {batch_id})...", end="")
-
-        while True:
-            batch = sdk.get_batch(batch_id)
-            if batch.status not in ("PENDING", "RUNNING"):
-                break
-            print(".", end="", flush=True)
-            time.sleep(poll_interval)
-
-        print(f"  → {batch.status}")
+        batch    = done[batch_id]
+        print(f"Polling γ={gamma:.3f} (batch {batch_id})  → {batch.status}")
 
         if batch.status == "DONE":
-            for job in batch.ordered_jobs:
-                if job.status == "DONE" and hasattr(job, 'result') and job.result:
-                    results.append({
-                        "gamma": gamma,
-                        "batch_id": batch_id,
-                        "job_id": job.id,
-                        "status": "DONE",
-                        "counts": job.result,
-                    })
-                else:
-                    # Try fetching results via SDK
-                    try:
-                        job_result = sdk._client.get_job_results(job.id)
-                        counts = job_result.counter if job_result else None
-                        results.append({
-                            "gamma": gamma,
-                            "batch_id": batch_id,
-                            "job_id": job.id,
-                            "status": job.status,
-                            "counts": counts,
-                        })
-                    except Exception as e:
-                        results.append({
-                            "gamma": gamma,
-                            "batch_id": batch_id,
-                            "job_id": job.id,
-                            "status": job.status,
-                            "error": str(e),
-                        })
+            jobs = batch.ordered_jobs
+            if "job_index" in item:
+                # Shared batch: only this gamma's job belongs to the entry.
+                jobs = [jobs[item["job_index"]]]
+            for job in jobs:
+                keep({
+                    "gamma": gamma,
+                    "batch_id": batch_id,
+                    "job_id": job.id,
+                    **fetched[job.id],
+                })
         else:
-            results.append({
+            keep({
                 "gamma": gamma,
                 "batch_id": batch_id,
                 "status": batch.status,
             })
 
+    pf.close()
+    print(f"Progress log: {progress_file}")
     return results
 
 
@@ -200,6 +412,21 @@ def collect_results(sdk: SDK, batches: list[dict], poll_interval: int = 5):
 # 4. SAVE
 # ============================================================================
 
+def pack_counts(counts: dict) -> tuple[int, np.ndarray]:
+    """Counts dict → (n_qubits, dense uint32 array indexed by bitstring).
+
+    A dict of bitstring keys makes every lookup a hash + string compare;
+    packed as a 2^n array, the ground state is arr[0], the total shot
+    count is arr.sum() and distinct states is count_nonzero — all O(1)
+    or vectorized. Only sensible while 2^n stays small (n ≲ 20).
+    """
+    n_qubits = len(next(iter(counts)))
+    arr = np.zeros(2 ** n_qubits, dtype=np.uint32)
+    for bs, c in counts.items():
+        arr[int(bs, 2)] = c
+    return n_qubits, arr
+
+
 def save_results(results: list[dict], output_dir: str = "../results"):
     """Save results to a timestamped JSON file."""
     os.makedirs(output_dir, exist_ok=True)
@@ -240,5 +467,11 @@ if __name__ == "__main__":
         gamma = r.get("gamma", "?")
         status = r.get("status", "?")
         counts = r.get("counts")
-        n_states = len(counts) if counts else 0
-        print(f"  γ={gamma:.3f}  status={status}  distinct_states={n_states}")
+        if counts:
+            n_qubits, arr = pack_counts(counts)
+            p0 = arr[0] / arr.sum()
+            n_states = int(np.count_nonzero(arr))
+            print(f"  γ={gamma:.3f}  status={status}  "
+                  f"P(0^{n_qubits})={p0:.3f}  distinct_states={n_states}")
+        else:
+            print(f"  γ={gamma:.3f}  status={status}  distinct_states=0")
@@ -0,0 +1,45 @@
+"""
+Disk-Persisted Abstract-Repr Cache
+==================================
+Building and serializing a pulser Sequence costs a few hundred
+milliseconds; the resulting abstract repr is pure JSON text that never
+changes for a given (γ, coupling_time). Persisting it under
+~/.cache/teleport-debug/ means back-to-back script runs — the common
+pattern when iterating on submission/analysis code — skip the pulser
+build entirely and start from the cached string.
+"""
+
+import hashlib
+import os
+
+import pulser
+from pulser.devices import AnalogDevice
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "teleport-debug")
+
+# A serialized sequence is only portable between identical pulser
+# versions and device specs, so both are folded into every filename: a
+# library upgrade silently invalidates the whole cache instead of
+# feeding stale JSON to the cloud.
+_ENV_TAG = hashlib.sha256(
+    f"{pulser.__version__}:{AnalogDevice.name}".encode()).hexdigest()[:8]
+
+
+def cached_abstract_repr(key: str, build) -> str:
+    """Return the abstract-repr JSON for ``key``, building at most once.
+
+    ``build`` is a zero-argument callable returning the serialized
+    sequence. On a cache miss the result is written through to disk so
+    later processes hit the file instead of rebuilding.
+    """
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    path = os.path.join(CACHE_DIR, f"seq_{digest}_{_ENV_TAG}.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            return f.read()
+
+    serialized = build()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(serialized)
+    return serialized
@@ -32,6 +32,9 @@ BENCHMARK:
   If F ≈ 0.5: total decoherence (wormhole collapsed)
 """
 
+import multiprocessing
+import os
+
 import numpy as np
 from qiskit import QuantumCircuit, QuantumRegister, ClassicalRegister, transpile
 
@@ -51,48 +54,50 @@ except ImportError:
 
 print(f"Backend: {backend.name}")
 
+# Density-matrix evolution turns the dephasing average into one exact
+# channel evaluation per gamma (see Part 2).
+from qiskit.quantum_info import DensityMatrix, Kraus
+
 SHOTS = 4000
 
 # ============================================================================
 # CIRCUIT BUILDER
 # ============================================================================
-def build_teleport_circuit(message='0', decoherence_gamma=0.0):
+def build_teleport_circuit(message='0', dephasing_marker=False):
     """
-    Build a 3-qubit teleportation circuit with optional phase damping.
-    
+    Build a 3-qubit teleportation circuit.
+
     q0 = Message qubit
     q1 = Alice (half of Bell pair / boundary A)
     q2 = Bob   (half of Bell pair / boundary B)
-    
-    Phase damping is applied via Rz rotations that simulate
-    dephasing: Rz(gamma * pi * random_phase) on each qubit
-    after the Bell pair creation. This models the CFD decoherence
-    parameter gamma.
-    
+
+    The circuit itself is noiseless; CFD decoherence enters through the
+    dephasing markers, where the Part 2 density-matrix evaluation
+    attaches the exact phase-damping channel.
+
     Args:
         message: '0' or '1'
-        decoherence_gamma: float in [0, 1], CFD noise parameter
+        dephasing_marker: place an identity on each qubit after the
+            Bell pair creation as an attachment point for the
+            phase-damping channel.
     """
     qr = QuantumRegister(3, 'q')
     cr = ClassicalRegister(3, 'c')
     qc = QuantumCircuit(qr, cr)
-    
+
     # 1. Prepare message
     if message == '1':
         qc.x(qr[0])
-    
+
     # 2. Create Bell pair (ER bridge)
     qc.h(qr[1])
     qc.cx(qr[1], qr[2])
-    
-    # 3. Apply CFD decoherence (phase damping model)
-    # Random Z-rotations scaled by gamma simulate dephasing
-    if decoherence_gamma > 0:
-        rng = np.random.default_rng()
+
+    # 3. CFD decoherence attachment point (phase damping applied here)
+    if dephasing_marker:
         for q in range(3):
-            angle = decoherence_gamma * np.pi * rng.uniform(-1, 1)
-            qc.rz(angle, qr[q])
-    
+            qc.id(qr[q])
+
     # 4. Bell measurement (message + Alice)
     qc.cx(qr[0], qr[1])
     qc.h(qr[0])
@@ -120,21 +125,22 @@ def compute_fidelity(counts, expected_bob):
     Correction rule: if c[1]=1, flip c[2].
     Then check if corrected c[2] matches expected_bob.
     """
-    total = sum(counts.values())
-    correct = 0
-    
-    for bitstring, count in counts.items():
-        bits = bitstring.replace(' ', '')
-        bob_raw = int(bits[0])    # c[2]
-        alice = int(bits[1])      # c[1]
-        
-        # Apply X correction if Alice measured 1
-        bob_corrected = (1 - bob_raw) if alice == 1 else bob_raw
-        
-        if bob_corrected == expected_bob:
-            correct += count
-    
-    return correct / total
+    # Decode every key in one pass: the joined bitstrings become a flat
+    # byte array reshaped to (states, bits), and the correction + match
+    # is a masked NumPy sum instead of a per-bitstring Python loop.
+    # float64 so exact probability distributions work as "counts" too
+    cnts = np.fromiter(counts.values(), dtype=np.float64, count=len(counts))
+    bits = np.frombuffer(
+        ''.join(k.replace(' ', '') for k in counts).encode(),
+        dtype=np.uint8).reshape(len(counts), -1) - ord('0')
+
+    bob_raw = bits[:, 0]     # c[2]  (MSB first)
+    alice   = bits[:, 1]     # c[1]
+
+    # Apply X correction where Alice measured 1
+    bob_corrected = np.where(alice == 1, 1 - bob_raw, bob_raw)
+
+    return float(cnts[bob_corrected == expected_bob].sum() / cnts.sum())
 
 
 # ============================================================================
@@ -145,7 +151,7 @@ print("PART 1: NOISELESS BASELINE")
 print("=" * 60)
 
 for msg in ['0', '1']:
-    qc = build_teleport_circuit(message=msg, decoherence_gamma=0.0)
+    qc = build_teleport_circuit(message=msg)
     qc_t = transpile(qc, backend)
     job = backend.run(qc_t, shots=SHOTS)
     counts = job.result().get_counts()
@@ -163,41 +169,65 @@ print("PART 2: DECOHERENCE SWEEP (gamma = 0.0 to 1.0)")
 print("=" * 60)
 print(f"  Classical bound: F = 0.6667")
 print(f"  CFD critical threshold: gamma_c ~ 0.535")
-print(f"  Shots per point: {SHOTS}")
+print(f"  Method: exact density-matrix dephasing channel")
 print()
 
-# Note: This models decoherence statistically by averaging over
-# many random Rz angles for each gamma. Each "shot" gets the SAME
-# random angles (set per circuit), so we run multiple circuits per gamma.
-NUM_CIRCUITS_PER_GAMMA = 20  # Average over 20 random noise instances
-
+# Averaging Rz(θ) with θ ~ U[-γπ, γπ] over noise instances is a
+# Monte-Carlo estimate of the exact phase-damping channel
+# E(ρ) = (1-p)ρ + p·ZρZ whose off-diagonal factor is sinc(γπ) — i.e.
+# λ = 1 - sinc(γπ)². Evolving the 8x8 density matrix through the
+# circuit with that channel applied at the dephasing markers yields the
+# exact outcome distribution in one O(2^(2q)) pass per (γ, message):
+# no shot noise, no instance averaging, independent of SHOTS.
 gamma_values = np.linspace(0, 1.0, 21)
 results_sweep = []
 
+marker_circuits = {
+    msg: build_teleport_circuit(msg, dephasing_marker=True)
+    for msg in ('0', '1')
+}
+
+
+def _fidelity_analytic(gamma, msg):
+    """Exact dephasing-channel fidelity from the final density matrix."""
+    lam = 1.0 - np.sinc(gamma) ** 2          # np.sinc(γ) = sin(γπ)/(γπ)
+    damp = Kraus([np.diag([1.0, np.sqrt(1.0 - lam)]),
+                  np.diag([0.0, np.sqrt(lam)])])
+    qc = marker_circuits[msg]
+    rho = DensityMatrix.from_int(0, 2 ** qc.num_qubits)
+    for inst in qc.data:
+        if inst.operation.name == 'measure':
+            continue  # Z-basis outcome probabilities are read off rho
+        qargs = [qc.find_bit(q).index for q in inst.qubits]
+        if inst.operation.name == 'id':
+            rho = rho.evolve(damp, qargs)    # dephasing attachment point
+        else:
+            rho = rho.evolve(inst.operation, qargs)
+    # probabilities_dict keys follow the same 'q2 q1 q0' bitstring
+    # convention as measurement counts, so the classical-correction
+    # post-processing is shared with the sampled path.
+    return compute_fidelity(rho.probabilities_dict(), int(msg))
+
+
+def run_one_gamma(idx):
+    """Exact F(|0>), F(|1>) for gamma_values[idx]."""
+    gamma = gamma_values[idx]
+    return (gamma, _fidelity_analytic(gamma, '0'),
+            _fidelity_analytic(gamma, '1'))
+
+
 print(f"  {'gamma':>6s}  {'F(|0>)':>8s}  {'F(|1>)':>8s}  {'F_avg':>8s}  {'Status'}")
 print(f"  {'-'*6}  {'-'*8}  {'-'*8}  {'-'*8}  {'-'*20}")
 
-for gamma in gamma_values:
-    fidelities_0 = []
-    fidelities_1 = []
-    
-    for _ in range(NUM_CIRCUITS_PER_GAMMA):
-        # Send |0>
-        qc0 = build_teleport_circuit('0', gamma)
-        qc0_t = transpile(qc0, backend)
-        job0 = backend.run(qc0_t, shots=SHOTS // NUM_CIRCUITS_PER_GAMMA)
-        c0 = job0.result().get_counts()
-        fidelities_0.append(compute_fidelity(c0, 0))
-        
-        # Send |1>
-        qc1 = build_teleport_circuit('1', gamma)
-        qc1_t = transpile(qc1, backend)
-        job1 = backend.run(qc1_t, shots=SHOTS // NUM_CIRCUITS_PER_GAMMA)
-        c1 = job1.result().get_counts()
-        fidelities_1.append(compute_fidelity(c1, 1))
-    
-    f0_avg = np.mean(fidelities_0)
-    f1_avg = np.mean(fidelities_1)
+# Each gamma's workload is independent, so fan the sweep out across
+# processes. The explicit fork context lets workers inherit the marker
+# circuits and backend; pool.map returns in input order, so the table
+# prints exactly as before.
+_ctx = multiprocessing.get_context("fork")
+with _ctx.Pool(processes=min(os.cpu_count() or 1, len(gamma_values))) as _pool:
+    sweep_points = _pool.map(run_one_gamma, range(len(gamma_values)))
+
+for gamma, f0_avg, f1_avg in sweep_points:
     f_avg = (f0_avg + f1_avg) / 2
     
     if f_avg > 0.99:
@@ -222,32 +252,38 @@ print("\n" + "=" * 60)
 print("PART 3: SUMMARY")
 print("=" * 60)
 
-# Find where fidelity drops below classical bound
-crossed = False
-for gamma, f0, f1, favg in results_sweep:
-    if favg < 0.667 and not crossed:
-        print(f"\n  Quantum advantage lost at gamma ~ {gamma:.3f}")
-        crossed = True
+# Find where fidelity drops below classical bound. A structured array
+# gives named columns over the sweep tuples; argmax on the boolean mask
+# returns the first crossing (or 0 when nothing crossed, hence the
+# recheck of the flagged row).
+arr = np.array(results_sweep,
+               dtype=[('gamma', 'f8'), ('f0', 'f8'), ('f1', 'f8'),
+                      ('favg', 'f8')])
+idx = int(np.argmax(arr['favg'] < 0.667))
+if arr['favg'][idx] < 0.667:
+    print(f"\n  Quantum advantage lost at gamma ~ {arr['gamma'][idx]:.3f}")
 
 print(f"\n  Results array (for plotting):")
-print(f"  gamma = {[round(r[0], 3) for r in results_sweep]}")
-print(f"  F_avg = {[round(r[3], 4) for r in results_sweep]}")
+print(f"  gamma = {arr['gamma'].round(3).tolist()}")
+print(f"  F_avg = {arr['favg'].round(4).tolist()}")
 
 print(f"""
   INTERPRETATION:
   ---------------
-  On a noiseless simulator, teleportation gives F = 1.0 at all gamma.
-  This is because the BasicSimulator applies gates exactly -- the Rz 
-  rotations in the decoherence model are deterministic per circuit.
-  
-  The proper test of CFD predictions requires EITHER:
-    (a) A density-matrix simulator with genuine phase damping channels
-    (b) Real quantum hardware where intrinsic noise provides gamma > 0
-  
+  Part 2 evaluates the phase-damping channel exactly (density-matrix
+  evolution, lambda = 1 - sinc(gamma*pi)^2) -- no sampling and no
+  simulator artifact. F = 1.0 at all gamma is the true channel result:
+  the Z-basis messages |0> and |1> are eigenstates of the dephasing
+  axis, so pure dephasing cannot degrade them. A gamma threshold only
+  appears for superposition inputs or noise with X/Y components.
+
+  The proper test of CFD predictions therefore requires real quantum
+  hardware, where intrinsic noise is not confined to the Z axis.
+
   FOR HARDWARE (IonQ Forte-1):
   ----------------------------
-  Use the circuit from build_teleport_circuit(message, gamma=0.0)
-  with NO artificial decoherence. The hardware's intrinsic noise IS 
+  Use the circuit from build_teleport_circuit(message)
+  with NO artificial decoherence. The hardware's intrinsic noise IS
   the decoherence. Compare the measured fidelity against:
     F = 1.000  (noiseless simulation)
     F = 0.667  (classical bound)
@@ -265,12 +301,22 @@ print("=" * 60)
 print("HARDWARE-READY CIRCUITS (gate counts)")
 print("=" * 60)
 
+
+HARDWARE_BASIS = ('cx', 'id', 'rz', 'ry', 'rx', 'h', 'measure')
+
+# build_teleport_circuit only emits h/cx/x/measure, all of which the
+# hardware basis above keeps verbatim except x (relabeled to rx(π) by the
+# basis translator — a 1:1 rename that changes neither count nor depth).
+# Reading the counts off the raw circuit therefore matches the full
+# transpile output without running the pass manager at all.
+_BASIS_RENAME = {'x': 'rx'}
+
 for msg in ['0', '1']:
-    qc = build_teleport_circuit(msg, 0.0)
-    qc_t = transpile(qc, basis_gates=['cx', 'id', 'rz', 'ry', 'rx', 'h', 'measure'])
-    gate_counts = qc_t.count_ops()
-    depth = qc_t.depth()
+    qc = build_teleport_circuit(msg)
+    gate_counts = {_BASIS_RENAME.get(name, name): n
+                   for name, n in qc.count_ops().items()}
+    depth = qc.depth()
     print(f"\n  Send |{msg}>:")
-    print(f"    Gates: {dict(gate_counts)}")
+    print(f"    Gates: {gate_counts}")
     print(f"    Depth: {depth}")
-    print(f"    Qubits: {qc_t.num_qubits}")
+    print(f"    Qubits: {qc.num_qubits}")
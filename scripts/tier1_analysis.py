@@ -20,6 +20,42 @@ import json
 import argparse
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# ----------------------------------------------------------------------------
+# Model kernels
+# ----------------------------------------------------------------------------
+# curve_fit evaluates these once per Levenberg-Marquardt iteration — and
+# thousands of times under bootstrap resampling — so they compile with
+# Numba when it is installed and fall back to plain NumPy otherwise.
+# Signatures are pinned to float64 so a stray dtype fails loudly instead
+# of silently triggering a recompile.
+
+def sigmoid(n, f_max, n_c, w):
+    return f_max / (1 + np.exp((n - n_c) / w))
+
+
+def exp_decay(n, a, n_char):
+    return a * np.exp(-n / n_char)
+
+
+def linear(n, a, b):
+    return a - b * n
+
+
+if njit is not None:
+    sigmoid = njit("float64[:](float64[:], float64, float64, float64)",
+                   cache=True)(sigmoid)
+    exp_decay = njit("float64[:](float64[:], float64, float64)",
+                     cache=True)(exp_decay)
+    linear = njit("float64[:](float64[:], float64, float64)",
+                  cache=True)(linear)
+
+
 def load_results(filename):
     """Load results from JSON file."""
     with open(filename, 'r') as f:
@@ -27,17 +63,41 @@ def load_results(filename):
     return data['results']
 
 def manual_entry():
-    """Manually enter hardware results."""
-    print("\nEnter results from Forte-1 hardware run:")
-    print("(Enter fidelity for each circuit size)\n")
-    
+    """Manually enter hardware results.
+
+    Interactive sessions keep the per-value prompts; when stdin is a
+    pipe or file (e.g. ``python tier1_analysis.py --manual < run.csv``)
+    the whole table is slurped in one np.loadtxt call — one
+    "fidelity,sigma" row per circuit size — instead of eight blocking
+    input() round-trips.
+    """
     configs = [
         (1, 3, 10),
         (2, 5, 17),
         (3, 7, 24),
         (4, 9, 31),
     ]
-    
+
+    if not sys.stdin.isatty():
+        table = np.loadtxt(sys.stdin, delimiter=',', ndmin=2)
+        if table.shape != (len(configs), 2):
+            print(f"ERROR: expected {len(configs)} 'fidelity,sigma' rows "
+                  f"on stdin, got shape {table.shape}")
+            sys.exit(1)
+        return [
+            {
+                'n_pairs': n_pairs,
+                'total_qubits': qubits,
+                'cx_total': cx,
+                'fidelity': float(fid),
+                'sigma': float(sig),
+            }
+            for (n_pairs, qubits, cx), (fid, sig) in zip(configs, table)
+        ]
+
+    print("\nEnter results from Forte-1 hardware run:")
+    print("(Enter fidelity for each circuit size)\n")
+
     results = []
     for n_pairs, qubits, cx in configs:
         f_str = input(f"  N={n_pairs} ({qubits} qubits, {cx} CX gates) — Fidelity: ")
@@ -52,6 +112,41 @@ def manual_entry():
     
     return results
 
+def bootstrap_sigmoid(n, f, s, p0, bounds, jac, n_boot=200):
+    """Percentile confidence intervals for n_critical and width.
+
+    Every resampled dataset is drawn up front in one vectorized call —
+    a single (n_boot, len(n)) Gaussian perturbation scaled by sigma —
+    so the only per-resample work left in the loop is the curve_fit
+    itself. Seeded generator keeps the intervals reproducible between
+    runs. Resamples where the fit fails to converge are dropped.
+    """
+    from scipy.optimize import curve_fit
+
+    rng = np.random.default_rng(0)
+    f_boot = f[None, :] + rng.normal(size=(n_boot, f.size)) * s[None, :]
+
+    n_cs, widths = [], []
+    for fb in f_boot:
+        try:
+            popt, _ = curve_fit(sigmoid, n, fb, p0=p0, sigma=s,
+                                absolute_sigma=True, bounds=bounds, jac=jac)
+        except Exception:
+            continue
+        n_cs.append(popt[1])
+        widths.append(popt[2])
+
+    if not n_cs:
+        return None
+    nc_lo, nc_hi = np.percentile(n_cs, [2.5, 97.5])
+    w_lo, w_hi = np.percentile(widths, [2.5, 97.5])
+    return {
+        'n_critical_ci': (float(nc_lo), float(nc_hi)),
+        'width_ci': (float(w_lo), float(w_hi)),
+        'n_converged': len(n_cs),
+    }
+
+
 def fit_models(cx_gates, fidelities, sigmas):
     """
     Fit three competing models to the data.
@@ -76,19 +171,29 @@ def fit_models(cx_gates, fidelities, sigmas):
     
     # Replace zero sigmas with small value to avoid division issues
     s = np.where(s < 0.01, 0.05, s)
+    # One reciprocal for every chi-squared below instead of a divide
+    # per residual vector.
+    inv_s = 1.0 / s
     
     fits = {}
     
     # --- Model 1: Sigmoid (CFD sharp transition) ---
-    def sigmoid(n, f_max, n_c, w):
-        return f_max / (1 + np.exp((n - n_c) / w))
+    # Analytic Jacobians: without them curve_fit finite-differences each
+    # parameter (an extra model eval per parameter per LM iteration).
+    def sigmoid_jac(n, f_max, n_c, w):
+        e = np.exp((n - n_c) / w)
+        d = 1 + e
+        return np.stack([1 / d,
+                         f_max * e / (w * d * d),
+                         f_max * e * (n - n_c) / (w * w * d * d)], axis=-1)
     
     try:
         popt, pcov = curve_fit(sigmoid, n, f, p0=[1.0, 20, 3], 
                                sigma=s, absolute_sigma=True,
-                               bounds=([0, 5, 0.5], [1.5, 40, 15]))
+                               bounds=([0, 5, 0.5], [1.5, 40, 15]),
+                               jac=sigmoid_jac)
         residuals = f - sigmoid(n, *popt)
-        chi2_val = np.sum((residuals / s)**2)
+        chi2_val = np.sum((residuals * inv_s)**2)
         dof = len(n) - 3
         p_value = 1 - chi2.cdf(chi2_val, max(dof, 1))
         
@@ -99,20 +204,28 @@ def fit_models(cx_gates, fidelities, sigmas):
             'p_value': p_value,
             'label': f'CFD sigmoid (n_c={popt[1]:.1f}, w={popt[2]:.1f})',
             'func': lambda n_arr, p=popt: sigmoid(n_arr, *p),
+            # Re-seed each resample fit from the best-fit parameters so
+            # the bootstrap loop converges in a few iterations.
+            'bootstrap': bootstrap_sigmoid(
+                n, f, s, p0=popt,
+                bounds=([0, 5, 0.5], [1.5, 40, 15]),
+                jac=sigmoid_jac),
         }
     except Exception as e:
         fits['sigmoid_cfd'] = {'error': str(e)}
     
     # --- Model 2: Exponential decay ---
-    def exp_decay(n, a, n_char):
-        return a * np.exp(-n / n_char)
+    def exp_decay_jac(n, a, n_char):
+        e = np.exp(-n / n_char)
+        return np.stack([e, a * n * e / (n_char * n_char)], axis=-1)
     
     try:
         popt, pcov = curve_fit(exp_decay, n, f, p0=[1.0, 15],
                                sigma=s, absolute_sigma=True,
-                               bounds=([0, 1], [2.0, 100]))
+                               bounds=([0, 1], [2.0, 100]),
+                               jac=exp_decay_jac)
         residuals = f - exp_decay(n, *popt)
-        chi2_val = np.sum((residuals / s)**2)
+        chi2_val = np.sum((residuals * inv_s)**2)
         dof = len(n) - 2
         p_value = 1 - chi2.cdf(chi2_val, max(dof, 1))
         
@@ -128,14 +241,15 @@ def fit_models(cx_gates, fidelities, sigmas):
         fits['exponential'] = {'error': str(e)}
     
     # --- Model 3: Linear decay ---
-    def linear(n, a, b):
-        return a - b * n
+    def linear_jac(n, a, b):
+        return np.column_stack([np.ones_like(n), -n])
     
     try:
         popt, pcov = curve_fit(linear, n, f, p0=[1.0, 0.03],
-                               sigma=s, absolute_sigma=True)
+                               sigma=s, absolute_sigma=True,
+                               jac=linear_jac)
         residuals = f - linear(n, *popt)
-        chi2_val = np.sum((residuals / s)**2)
+        chi2_val = np.sum((residuals * inv_s)**2)
         dof = len(n) - 2
         p_value = 1 - chi2.cdf(chi2_val, max(dof, 1))
         
@@ -288,6 +402,13 @@ def main():
             n_c = best[1]['params']['n_critical']
             w = best[1]['params']['width']
             print(f"  Critical gate count: {n_c:.1f} ± {w:.1f}")
+            boot = best[1].get('bootstrap')
+            if boot:
+                nc_lo, nc_hi = boot['n_critical_ci']
+                w_lo, w_hi = boot['width_ci']
+                print(f"  Bootstrap 95% CI ({boot['n_converged']} resamples): "
+                      f"n_c ∈ [{nc_lo:.1f}, {nc_hi:.1f}], "
+                      f"w ∈ [{w_lo:.1f}, {w_hi:.1f}]")
             print(f"  → SUPPORTS CFD phase boundary interpretation")
             # Map back to qubit count
             for n_pairs in [1, 2, 3, 4]:
@@ -1,112 +1,132 @@
+import asyncio
 import os
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import numpy as np
-from azure.quantum import Workspace
-from azure.quantum.target.pasqal import Pasqal
-from azure.identity import DeviceCodeCredential
 
-# Import our sequence builder
 try:
-    from wormhole_pulser_continuous import build_wormhole_sequence
+    # SIMD-accelerated (de)serializer for the abstract-repr payloads,
+    # which carry the full device + layout blob. stdlib json stays for
+    # the human-readable debug files.
+    import orjson
 except ImportError:
-    import sys
-    sys.path.append(os.path.join(os.path.dirname(__file__), '../code'))
-    from wormhole_pulser_continuous import build_wormhole_sequence
+    orjson = None
 
-# ============================================================================
-# 1. SETUP AZURE WORKSPACE
-# ============================================================================
 
-# Default values — override via environment variables or .env file
-DEFAULTS = {
-    "AZURE_LOCATION": "eastus",
-}
+def _loads(s):
+    return orjson.loads(s) if orjson is not None else json.loads(s)
 
 
-def get_workspace():
-    """Authenticate and return an Azure Quantum Workspace handle."""
+def _dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
 
-    tenant_id = os.environ.get("AZURE_TENANT_ID")
-    resource_id = os.environ.get("AZURE_RESOURCE_ID")
-    location = os.environ.get("AZURE_LOCATION", DEFAULTS["AZURE_LOCATION"])
-
-    # We check for missing vars in __main__, but good to check here too if called as lib
-    if not tenant_id or not resource_id:
-        raise EnvironmentError(
-            "AZURE_TENANT_ID and AZURE_RESOURCE_ID must be set as environment "
-            "variables. Example:\n"
-            "  export AZURE_TENANT_ID='5b322a00-...'\n"
-            "  export AZURE_RESOURCE_ID='/subscriptions/fe4d586e-...'"
-        )
-
-    print(f"Authenticating to Azure (Location: {location})...")
-    credential = DeviceCodeCredential(tenant_id=tenant_id)
+# Import our sequence builder and the shared Azure handles. The memoized
+# workspace/target in _azure persist their token cache to disk, so
+# running this script back-to-back with the others skips the device-code
+# prompt and the target metadata fetch.
+try:
+    from wormhole_pulser_continuous import build_wormhole_sequence
+    from _azure import get_target
+except ImportError:
+    import sys
+    sys.path.append(os.path.join(os.path.dirname(__file__), '../code'))
+    from wormhole_pulser_continuous import build_wormhole_sequence
+    from _azure import get_target
 
-    workspace = Workspace(
-        resource_id=resource_id,
-        location=location,
-        credential=credential,
-    )
-    return workspace
+from _pulser_cache import cached_abstract_repr
 
 
 # ============================================================================
 # 2. JOB SUBMISSION
 # ============================================================================
 
-def submit_experiment(workspace, gamma_values=None, shots=100):
-    """Build and submit one job per gamma value to the Pasqal emulator."""
+@lru_cache(maxsize=32)
+def _base_payload(gamma, coupling_time=500):
+    """Parsed abstract-repr payload for one (γ, coupling_time).
+
+    The sequence builder already caches the γ-independent skeleton, but
+    serializing and re-parsing the payload was still paid per call;
+    memoizing here means repeated probes of the same point (common when
+    iterating on backend-compatibility variations) build, serialize and
+    parse exactly once per process — and the write-through disk cache
+    in _pulser_cache carries the serialized JSON across processes, so
+    re-running the script skips the pulser build too. Callers must
+    treat the returned dict as read-only — apply_patch copies, never
+    mutates.
+    """
+    serialized = cached_abstract_repr(
+        f"azure-wormhole:{gamma}:{coupling_time}",
+        lambda: build_wormhole_sequence(
+            gamma=gamma, coupling_time=coupling_time).to_abstract_repr())
+    return _loads(serialized)
+
+
+def apply_patch(base, deletes, updates):
+    """Shallow overlay of a parsed payload: copy minus ``deletes``, with
+    ``updates`` replacing top-level keys. Key order is preserved, so the
+    serialized output matches an in-place edit of the original."""
+    out = {k: v for k, v in base.items() if k not in deletes}
+    out.update(updates)
+    return out
+
+
+def submit_experiment(target, gamma_values=None, shots=100):
+    """Build and submit one job per gamma value to the given target."""
 
     if gamma_values is None:
         gamma_values = [0.0, 0.535]
 
-    target = Pasqal(workspace, name="pasqal.sim.emu-tn")
     print(f"Connected to target: {target.name}")
 
-    jobs = []
+    # Backend-compatibility fixes, applied as a patch per payload:
+    #  - the Azure backend often rejects the 'device' field if it
+    #    conflicts with its own device definition, so it is dropped;
+    #  - some Pasqal validators strictly require 3D coordinates, and the
+    #    register is gamma-independent, so the z-injected register is
+    #    computed once here and shared across every variation instead of
+    #    being rebuilt atom-by-atom per payload.
+    first = _base_payload(gamma_values[0])
+    updates = {}
+    if isinstance(first.get('register'), list):
+        updates['register'] = [atom if 'z' in atom else {**atom, 'z': 0.0}
+                               for atom in first['register']]
+
+    def prepare_and_submit(gamma):
+        data = apply_patch(_base_payload(gamma), {'device'}, updates)
 
-    for gamma in gamma_values:
-        print(f"\n--- Preparing job for gamma = {gamma} ---")
-
-        # Build the Pulser sequence and serialize to the JSON format
-        # that the Azure Pasqal target expects.
-        seq = build_wormhole_sequence(gamma=gamma, coupling_time=500)
-        json_str = seq.to_abstract_repr()
-        
-        # --- DEBUG: Modify JSON for Backend Compatibility ---
-        # The Azure backend often rejects the 'device' field if it conflicts 
-        # with its own device definition, or if the schema validation is strict.
-        # We try removing it.
-        data = json.loads(json_str)
-        if 'device' in data:
-            del data['device']
-
-        # --- FIX: Inject 'z' coordinate if missing ---
-        # Some Pasqal backend validators strictly require 3D coordinates.
-        if 'register' in data and isinstance(data['register'], list):
-            for atom in data['register']:
-                if 'z' not in atom:
-                    atom['z'] = 0.0
-        
         # Save exact JSON being submitted for debugging
         debug_filename = f"debug_sequence_g{gamma}.json"
         with open(debug_filename, 'w') as f:
             json.dump(data, f, indent=2)
-            
-        serialized = json.dumps(data) # Correctly serialize to string
 
-        print(f"Submitting job (gamma={gamma}, shots={shots})...")
+        serialized = _dumps(data) # Correctly serialize to string
+
+        return target.submit(
+            input_data=serialized,
+            name=f"wormhole_cfd_g{gamma}",
+            shots=shots,
+        )
+
+    # The probes are independent and entirely I/O-bound on the submit
+    # round trip, so fan them out over threads (the target's HTTP client
+    # is safe for independent jobs) and report in gamma order.
+    print(f"\nSubmitting {len(gamma_values)} jobs (shots={shots})...")
+    with ThreadPoolExecutor(max_workers=len(gamma_values)) as ex:
+        futures = {gamma: ex.submit(prepare_and_submit, gamma)
+                   for gamma in gamma_values}
+
+    jobs = []
+    for gamma in gamma_values:
         try:
-            job = target.submit(
-                input_data=serialized,
-                name=f"wormhole_cfd_g{gamma}",
-                shots=shots,
-            )
-            print(f"Job ID: {job.id}")
+            job = futures[gamma].result()
+            print(f"  gamma={gamma}  ->  Job ID: {job.id}")
             jobs.append({"gamma": gamma, "job": job})
         except Exception as e:
-            print(f"Failed to submit (gamma={gamma}): {e}")
+            print(f"  gamma={gamma}  ->  Failed to submit: {e}")
 
     return jobs
 
@@ -115,20 +135,57 @@ def submit_experiment(workspace, gamma_values=None, shots=100):
 # 3. RESULT RETRIEVAL
 # ============================================================================
 
+# Backoff schedule for job polling: wait_until_completed polls at a
+# fixed interval, overshooting fast jobs by most of an interval and
+# hammering the API on slow ones. Starting at 0.2s and growing 1.5x to
+# a 5s cap tracks sub-second probes closely while long queue waits cost
+# a handful of calls.
+POLL_BASE = 0.2
+POLL_CAP = 5.0
+
+
+async def _wait_one(job, timeout_secs=300):
+    """Backoff-poll one job until it leaves the queue or times out.
+
+    The blocking refresh runs in a worker thread via asyncio.to_thread,
+    so the event loop keeps every other job's poll in flight. Errors are
+    swallowed here and surfaced per job in the reporting loop.
+    """
+    delay = POLL_BASE
+    deadline = time.monotonic() + timeout_secs
+    while time.monotonic() < deadline:
+        try:
+            await asyncio.to_thread(job.refresh)
+        except Exception:
+            return
+        if job.details.status not in ("Waiting", "Executing"):
+            return
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, POLL_CAP)
+
+
+async def _wait_all(jobs, timeout_secs=300):
+    await asyncio.gather(
+        *(_wait_one(item["job"], timeout_secs) for item in jobs))
+
+
 def wait_and_save_results(jobs, output_dir="."):
     """Poll submitted jobs, collect results, and write them to a JSON file."""
 
     print("\n--- Waiting for results ---")
     results_data = []
 
+    # Wait on every job concurrently first: total wait becomes the
+    # slowest job's queue time rather than the sum over jobs. The
+    # reporting loop below then finds each job already terminal.
+    asyncio.run(_wait_all(jobs))
+
     for item in jobs:
         gamma = item["gamma"]
         job = item["job"]
 
-        print(f"Waiting for job {job.id} (gamma={gamma})...")
+        print(f"Collecting job {job.id} (gamma={gamma})...")
         try:
-            job.wait_until_completed(timeout_secs=300)
-
             status = job.details.status
             if status == "Succeeded":
                 result = job.get_results()
@@ -169,8 +226,13 @@ def wait_and_save_results(jobs, output_dir="."):
     timestamp = time.strftime("%Y%m%d_%H%M%S")
     filename = os.path.join(output_dir, f"pasqal_emu_results_{timestamp}.json")
 
-    with open(filename, "w") as f:
-        json.dump(results_data, f, indent=2)
+    if orjson is not None:
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(results_data, default=str,
+                                 option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, "w") as f:
+            json.dump(results_data, f, indent=2)
 
     print(f"\nResults saved to {filename}")
     return results_data
@@ -189,15 +251,15 @@ if __name__ == "__main__":
         print("  export AZURE_TENANT_ID='your-tenant-id'")
         print("  export AZURE_RESOURCE_ID='your-resource-id'")
         print()
-        # We don't exit here so the user sees the error from get_workspace or can set them interactively if code was modified
+        # We don't exit here so the user sees the error from get_target or can set them interactively if code was modified
     
     try:
-        ws = get_workspace()
+        target = get_target("pasqal.sim.emu-tn")
 
         # Three distinct coupling regimes:
         #   Vacuum (0.0), Critical (0.535), Deep (0.8)
         submitted_jobs = submit_experiment(
-            ws,
+            target,
             gamma_values=[0.0, 0.535, 0.8],
             shots=50,
         )